@@ -172,7 +172,7 @@ class AIDebugger:
         if not success:
             self.cascade.add_error_to_chain(error_type, message, conf.overall_confidence, attempt=1)
         self._record_attempt(envelope, success=success, note=strategy_outcome.get("details"))
-        self.memory.add_outcome(envelope.to_json())
+        self.memory.add_outcome(envelope)
 
         # 10) Decide next step
         if success:
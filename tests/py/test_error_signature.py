@@ -35,6 +35,10 @@ def test_normalize_removes_file_paths():
     normalized = ErrorSignature.normalize(error_with_path)
     assert normalized == "ValueError:Something went wrong"
 
+    traceback_ref = RuntimeError('boom File "/app/x.py", line 12 at worker.py:40\nsecond line')
+    assert ErrorSignature.normalize(traceback_ref) == "RuntimeError:boom"
+    assert ErrorSignature.normalize(KeyError()) == "KeyError:"
+
 
 def test_create_detailed_signature():
     """Test creating detailed error signature objects"""
@@ -46,6 +50,7 @@ def test_create_detailed_signature():
     assert signature.message == "test error message"
     assert signature.signature == "ValueError:test error message"
     assert len(signature.hash) == 8  # MD5 first 8 chars
+    assert signature.hash == "11cbaf3b"  # same value as the PHP port
 
 
 def test_are_same():
@@ -96,6 +101,48 @@ def test_error_tracker():
     assert frequent[0][1] == 2  # Count of most frequent error
 
 
+def test_record_if_new_normalizes_once():
+    tracker = ErrorTracker()
+    error = ValueError("flaky at worker.py:12")
+    original = ErrorSignature.normalize
+    calls = []
+
+    def counting_normalize(err):
+        calls.append(err)
+        return original(err)
+
+    ErrorSignature.normalize = staticmethod(counting_normalize)
+    try:
+        assert not tracker.has_seen(error)
+        assert tracker.record_if_new(error)
+    finally:
+        ErrorSignature.normalize = staticmethod(original)
+    assert calls == [error]  # has_seen's signature is reused by record_if_new
+    assert vars(error) == {}  # the caller's exception is left untouched
+    assert not tracker.record_if_new(ValueError("flaky at other.py:99"))
+    assert tracker.get_error_counts() == {"ValueError:flaky": 1}
+
+
+def test_tracker_memo_follows_changed_args():
+    tracker = ErrorTracker()
+    error = ValueError("first")
+    tracker.record(error)
+    error.args = ("second",)
+    assert not tracker.has_seen(error)
+    assert tracker.record(error).signature == "ValueError:second"
+
+
+def test_tracker_stats_follow_record_and_clear():
+    tracker = ErrorTracker()
+    for message in ["b", "a", "b", "c", "a"]:
+        tracker.record(ValueError(message))
+    assert tracker.get_most_frequent_errors(3) == [("ValueError:b", 2), ("ValueError:a", 2), ("ValueError:c", 1)]
+    assert [e.message for e in tracker.get_unique_errors()] == ["b", "a", "c"]
+    tracker.clear()
+    assert tracker.get_error_counts() == {}
+    assert tracker.get_unique_errors() == []
+
+
 def test_cross_language_consistency():
     """Test patterns that should be consistent across TypeScript/Python/PHP"""
     
@@ -114,5 +161,8 @@ if __name__ == "__main__":
     test_create_detailed_signature()
     test_are_same()
     test_error_tracker()
+    test_record_if_new_normalizes_once()
+    test_tracker_memo_follows_changed_args()
+    test_tracker_stats_follow_record_and_clear()
     test_cross_language_consistency()
     print("All Python ErrorSignature tests passed!")
\ No newline at end of file
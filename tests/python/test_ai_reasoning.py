@@ -0,0 +1,78 @@
+import json
+import os
+
+import pytest
+
+AI_REASONING_PATH = os.path.abspath(os.path.join(os.path.dirname(__file__), '..', '..', 'utils', 'python', 'ai_reasoning.py'))
+
+
+def _load_engine():
+    # AIEnhancedStrategy subclasses DebuggingStrategy without importing it, so
+    # only the learner/engine half of the module is loaded
+    with open(AI_REASONING_PATH) as handle:
+        source = handle.read().split("class AIEnhancedStrategy")[0]
+    namespace = {"__name__": "ai_reasoning_under_test"}
+    exec(compile(source, AI_REASONING_PATH, "exec"), namespace)
+    return namespace
+
+
+ai = _load_engine()
+
+
+class StubMemory:
+    def __init__(self, outcomes):
+        self.outcomes = outcomes
+
+    def get_similar_outcomes(self, context):
+        return [o for o in self.outcomes if o["error_type"] == context.get("error_type")]
+
+
+def _outcome(error_type, **envelope):
+    return {"error_type": error_type, "envelope": json.dumps(envelope)}
+
+
+def test_learner_caches_success_rate_and_rolling_average():
+    learner = ai["PatternLearner"]()
+    assert learner.get_success_rate("LogAndFixStrategy") is None
+    times = [0.5, 0.3, 1.0, 0.2]
+    for i, t in enumerate(times):
+        learner.learn_from_outcome("LogAndFixStrategy", i != 2, t)
+    stats = learner.get_pattern_stats()["LogAndFixStrategy"]
+    assert (stats["success_count"], stats["failure_count"]) == (3, 1)
+    assert stats["avg_time"] == pytest.approx(sum(times) / len(times))
+    assert learner.get_success_rate("LogAndFixStrategy") == 0.75
+
+
+def test_unseen_candidates_rank_as_zero_success():
+    learner = ai["PatternLearner"]()
+    candidates = list(ai["AIReasoningEngine"].AVAILABLE_STRATEGIES)
+    learner.learn_from_outcome("RollbackStrategy", False, 1.0)
+    # A failing pattern and unseen ones all rank 0.0: the first candidate wins the tie
+    assert learner.get_best_pattern(candidates) == "LogAndFixStrategy"
+    learner.learn_from_outcome("SecurityAuditStrategy", True, 1.0)
+    assert learner.get_best_pattern(candidates) == "SecurityAuditStrategy"
+
+
+def test_reason_batch_matches_per_context_reasoning():
+    learner = ai["PatternLearner"]()
+    learner.learn_from_outcome("LogAndFixStrategy", True, 0.5)
+    learner.learn_from_outcome("RollbackStrategy", False, 1.2)
+    memory = StubMemory([
+        _outcome("memory", success=True),
+        _outcome("memory", success=False, flagged_for_developer=True),
+        _outcome("syntax", success=False, simulation_details={"circuit_breaker_tripped": True}),
+    ])
+    contexts = [{"error_type": "memory"}, {"error_type": "syntax"}, {"error_type": "logic"}, {}]
+    engine = ai["AIReasoningEngine"](learner, memory)
+    batch = engine.reason_batch(contexts)
+    assert batch == [engine.reason_about_patch(c) for c in contexts]
+    assert batch[0]["learning_insights"]["success_rate_in_similar_cases"] == 0.5
+    assert batch[1]["learning_insights"]["patterns_to_avoid"] == ["Circuit breaker tripped - potential infinite loop"]
+    assert len(engine.decision_log) == 2 * len(contexts)
+
+
+def test_decision_log_keeps_only_recent_decisions():
+    engine = ai["AIReasoningEngine"](ai["PatternLearner"](), max_decision_log=3)
+    assert engine.decision_log.maxlen == 3
+    engine.reason_batch([{"error_type": f"e{i}"} for i in range(5)])
+    assert [entry["context"]["error_type"] for entry in engine.decision_log] == ["e2", "e3", "e4"]
@@ -0,0 +1,106 @@
+import io
+import json
+import sys, os
+ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), '..', '..'))
+if ROOT not in sys.path:
+    sys.path.insert(0, ROOT)
+from utils.python.cascading_error_handler import CascadingErrorHandler, SandboxExecution
+
+
+def test_severity_stamped_and_escalation_detected():
+    handler = CascadingErrorHandler()
+    handler.add_error_to_chain("syntax", "Missing semicolon", 0.9, 1)
+    handler.add_error_to_chain("unknown", "Odd failure", 0.95, 1)
+    assert [e.severity for e in handler.error_chain] == [1, 1]
+    assert handler.should_stop_attempting() == (False, "Continue attempting fixes")
+
+    handler.add_error_to_chain("security", "Injection risk", 0.99, 1)
+    assert handler.error_chain[-1].severity == 5
+    assert handler.should_stop_attempting() == (True, "Error severity escalating with each fix attempt")
+
+
+def test_cascade_analysis_recommendation_and_cache():
+    handler = CascadingErrorHandler()
+    assert handler.get_cascade_analysis() == {"cascade_depth": 0, "analysis": "No errors in cascade"}
+
+    handler.add_error_to_chain("logic", "Null pointer", 0.8, 1)
+    handler.add_error_to_chain("syntax", "Typo", 0.9, 1)
+    handler.add_error_to_chain("logic", "Off by one", 0.85, 2)
+    analysis = handler.get_cascade_analysis()
+    assert analysis["cascade_depth"] == 3
+    assert analysis["error_type_distribution"] == {"logic": 2, "syntax": 1}
+    assert analysis["most_common_error"] == "logic"
+    assert analysis["confidence_trend"] == "improving"
+    assert abs(analysis["average_confidence"] - 0.85) < 1e-9
+    assert analysis["recommendation"] == "Consider human review for complex logic issues"
+    assert handler._cascade_analysis() is handler._cascade_analysis()  # cached until the next error
+    analysis["cascade_depth"] = 0
+    analysis["error_type_distribution"]["logic"] = 99
+    again = handler.get_cascade_analysis()
+    assert again["cascade_depth"] == 3
+    assert again["error_type_distribution"] == {"logic": 2, "syntax": 1}
+    assert json.loads(handler.get_error_chain_json())["cascade_analysis"]["cascade_depth"] == 3
+
+    handler.add_error_to_chain("runtime", "Crash", 0.5, 1)
+    assert handler.get_cascade_analysis()["recommendation"] == "Consider rolling back to earlier successful state"
+
+    handler.reset_cascade()
+    assert handler.get_cascade_analysis()["cascade_depth"] == 0
+
+
+def test_error_chain_json_serializes_entries():
+    handler = CascadingErrorHandler()
+    handler.add_error_to_chain("syntax", "Typo", 0.9, 1)
+    payload = json.loads(handler.get_error_chain_json())
+    entry = payload["error_chain"][0]
+    assert entry["error_type"] == "syntax"
+    assert entry["severity"] == 1
+    assert entry["is_cascading"] is False
+
+
+def test_dump_error_chain_json_streams_same_payload():
+    handler = CascadingErrorHandler()
+    handler.add_error_to_chain("syntax", "Typo", 0.9, 1)
+    sink = io.StringIO()
+    handler.dump_error_chain_json(sink)
+    streamed = json.loads(sink.getvalue())
+    returned = json.loads(handler.get_error_chain_json())
+    streamed.pop("timestamp"), returned.pop("timestamp")
+    assert streamed == returned
+
+
+def test_degrading_confidence_stops_cascade():
+    handler = CascadingErrorHandler()
+    handler.add_error_to_chain("logic", "a", 0.9, 1)
+    handler.add_error_to_chain("syntax", "b", 0.8, 1)
+    handler.add_error_to_chain("syntax", "c", 0.8, 2)
+    assert handler._has_degrading_confidence() is False
+    handler.add_error_to_chain("logic", "d", 0.7, 1)
+    assert handler._has_degrading_confidence() is False
+    handler.add_error_to_chain("syntax", "e", 0.6, 3)
+    assert handler._has_degrading_confidence() is True
+
+
+def test_sandbox_summary_counts_passed_tests():
+    sandbox = SandboxExecution()
+    # len 15 fails unit (% 3) and integration (% 5), passes security (% 7)
+    result = sandbox.execute_patch({"patched_code": "x" * 15})
+    assert [t["passed"] for t in result["test_results"]] == [True, False, False, True, True]
+    summary = sandbox.get_execution_summary()
+    assert summary["tests_passed"] == 3
+    assert summary["tests_total"] == 5
+    assert summary["test_success_rate"] == 0.6
+
+
+def test_sandbox_accepts_string_isolation_level():
+    sandbox = SandboxExecution(isolation_level="partial")
+    result = sandbox.execute_patch({"patched_code": "ok"})
+    assert result["isolation_level"] == "partial"
+    assert sandbox.get_execution_summary()["isolation_level"] == "partial"
+
+
+def test_batch_execute_matches_individual_runs():
+    patches = [{"patched_code": "x" * n} for n in (15, 120, 7, 15, 3)]
+    batch = SandboxExecution().batch_execute(patches)
+    single = [SandboxExecution().execute_patch(p) for p in patches]
+    assert [r["test_results"] for r in batch] == [r["test_results"] for r in single]
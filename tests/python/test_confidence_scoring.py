@@ -0,0 +1,151 @@
+import math
+import pytest
+import sys, os
+ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), '..', '..'))
+if ROOT not in sys.path:
+    sys.path.insert(0, ROOT)
+from utils.python.confidence_scoring import (
+    UnifiedConfidenceScorer, ConfidenceComponents, ConfidenceScore, DualCircuitBreaker, ErrorType,
+    _softmax_cached
+)
+
+
+def test_softmax_matches_reference():
+    scorer = UnifiedConfidenceScorer()
+    logits = [2.5, 0.1, 0.05]
+    exps = [math.exp(l - 2.5) for l in logits]
+    expected = [e / sum(exps) for e in exps]
+    assert scorer._softmax(logits) == expected
+    assert scorer._softmax([]) == []
+
+
+def test_repeated_logits_reuse_cached_softmax():
+    scorer = UnifiedConfidenceScorer()
+    _softmax_cached.cache_clear()
+    logits = [1.2, 1.0, 0.8]
+    first = scorer.calculate_confidence(logits, ErrorType.LOGIC, {"complexity_score": 2.0})
+    second = scorer.calculate_confidence(logits, ErrorType.LOGIC, {"complexity_score": 2.0})
+    assert _softmax_cached.cache_info().hits >= 1
+    assert first == second
+
+
+COMPLEXITY_SWEEP = [0.0, 1.0, 2.5, 5.0, 10.0, 20.0]
+
+
+@pytest.mark.parametrize("complexity", COMPLEXITY_SWEEP)
+def test_complexity_penalty_bounds(complexity):
+    penalty = UnifiedConfidenceScorer._complexity_penalty(complexity)
+    assert penalty == max(0.1, 1.0 - (complexity - 1.0) * 0.1)
+    assert 0.1 <= penalty <= 1.1
+
+
+def test_batch_matches_single_calls_across_complexity_sweep():
+    scorer = UnifiedConfidenceScorer()
+    logits = [2.0, 0.5, 0.2]
+    sweep = [{"complexity_score": c} for c in COMPLEXITY_SWEEP]
+    batch = scorer.calculate_confidence_batch(logits, ErrorType.RUNTIME, sweep)
+    assert len(batch) == len(sweep)
+    for historical, score in zip(sweep, batch):
+        assert score == scorer.calculate_confidence(logits, ErrorType.RUNTIME, historical)
+
+
+def test_rows_match_single_calls_per_error_type():
+    scorer = UnifiedConfidenceScorer(temperature=1.5)
+    rows = [[2.0, 0.5, 0.2], [0.1, 0.1, 3.0], [1.0, 1.0, 1.0]]
+    types = [ErrorType.SYNTAX, ErrorType.LOGIC, ErrorType.SECURITY]
+    historical = {"complexity_score": 2.0, "test_coverage": 0.8}
+    batch = scorer.calculate_confidence_rows(rows, types, historical)
+    assert batch == [scorer.calculate_confidence(r, t, historical) for r, t in zip(rows, types)]
+    with pytest.raises(ValueError):
+        scorer.calculate_confidence_rows(rows, types[:1])
+
+
+def test_rows_accept_per_row_historical_data():
+    scorer = UnifiedConfidenceScorer()
+    rows = [[2.5, 0.1, 0.05], [1.2, 1.0, 0.8]]
+    types = [ErrorType.SYNTAX, ErrorType.LOGIC]
+    historical = [{"success_rate": 0.95, "complexity_score": 2.0}, {"success_rate": 0.5, "complexity_score": 7.0}]
+    batch = scorer.calculate_confidence_rows(rows, types, historical_rows=historical)
+    assert batch == [scorer.calculate_confidence(r, t, h) for r, t, h in zip(rows, types, historical)]
+    with pytest.raises(ValueError):
+        scorer.calculate_confidence_rows(rows, types, historical_rows=historical[:1])
+
+def test_beta_calibration_tracks_sliding_window():
+    scorer = UnifiedConfidenceScorer(calibration_samples=10)
+    for i in range(25):
+        scorer.record_outcome(0.5, i % 3 == 0)
+    window = list(scorer.historical_scores)
+    assert len(window) == 10
+    expected_rate = sum(1 for _, ok in window if ok) / 10
+    assert scorer._beta_calibrate(0.8) == 0.8 * 0.7 + expected_rate * 0.3
+
+
+@pytest.mark.parametrize("error_type,field,threshold", [
+    (ErrorType.SYNTAX, "syntax_confidence", 0.95),
+    (ErrorType.LOGIC, "logic_confidence", 0.80),
+    (ErrorType.RUNTIME, "logic_confidence", 0.80),
+    (ErrorType.SECURITY, "overall_confidence", 0.85),
+    (ErrorType.PERFORMANCE, "overall_confidence", 0.85),
+])
+def test_should_attempt_fix_thresholds(error_type, field, threshold):
+    scorer = UnifiedConfidenceScorer()
+    low = dict(overall_confidence=0.0, syntax_confidence=0.0, logic_confidence=0.0)
+    assert scorer.should_attempt_fix(ConfidenceScore(**{**low, field: threshold}), error_type) is True
+    assert scorer.should_attempt_fix(ConfidenceScore(**{**low, field: threshold - 0.01}), error_type) is False
+
+
+@pytest.mark.parametrize("error_type, budget_attr, open_state", [
+    (ErrorType.LOGIC, "logic_error_budget", "logic_open"),
+    (ErrorType.SYNTAX, "syntax_error_budget", "syntax_open"),
+])
+@pytest.mark.parametrize("successes, expect_open", [(4, False), (3, False), (2, True)])
+def test_breaker_opens_only_above_error_budget(error_type, budget_attr, open_state, successes, expect_open):
+    # One failure after 4/3/2 successes is a rate of 0.2/0.25/0.33 against a 0.25 budget
+    breaker = DualCircuitBreaker(syntax_max_attempts=100, logic_max_attempts=100,
+                                 **{budget_attr: 0.25})
+    for _ in range(successes):
+        breaker.record_attempt(error_type, True)
+    breaker.record_attempt(error_type, False)
+    state = breaker.get_state_summary()["circuit_state"]
+    if expect_open:
+        assert state == open_state
+        assert breaker.can_attempt(error_type)[0] is False
+    else:
+        assert state == "closed"
+        assert breaker.can_attempt(error_type) == (True, "OK")
+
+
+def test_breaker_honours_budget_changed_after_construction():
+    breaker = DualCircuitBreaker(logic_max_attempts=100, logic_error_budget=0.5)
+    breaker.record_attempt(ErrorType.LOGIC, True)
+    breaker.record_attempt(ErrorType.LOGIC, False)
+    assert breaker.can_attempt(ErrorType.LOGIC) == (True, "OK")
+    breaker.logic_error_budget = 0.25
+    assert breaker.can_attempt(ErrorType.LOGIC)[0] is False
+
+
+def test_logic_breaker_opens_when_budget_exceeded():
+    breaker = DualCircuitBreaker(logic_max_attempts=10, logic_error_budget=0.10)
+    for _ in range(9):
+        breaker.record_attempt(ErrorType.LOGIC, True)
+    assert breaker.can_attempt(ErrorType.RUNTIME) == (True, "OK")
+    breaker.record_attempt(ErrorType.LOGIC, False)
+    assert breaker.get_state_summary()["circuit_state"] == "logic_open"
+    assert breaker.can_attempt(ErrorType.LOGIC) == (False, "Logic circuit breaker open")
+
+
+@pytest.mark.parametrize("temperature", [1.0, 0.5, 2.0])
+def test_softmax_temperature_scaling(temperature):
+    logits = (3.0, 1.0, -2.0)
+    scaled = [l / temperature for l in logits]
+    exps = [math.exp(l - max(scaled)) for l in scaled]
+    expected = tuple(e / sum(exps) for e in exps)
+    assert _softmax_cached(logits, temperature) == expected
+
+
+def test_scores_are_slotted_and_default_components():
+    score = ConfidenceScore(overall_confidence=0.5, syntax_confidence=0.5, logic_confidence=0.5)
+    assert not hasattr(score, "__dict__")
+    assert score.components == ConfidenceComponents()
+    assert not hasattr(score.components, "__dict__")
+
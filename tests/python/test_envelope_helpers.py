@@ -19,6 +19,10 @@ def test_append_attempt_and_counters():
     assert env['counters']['totalAttempts'] == 1
     assert env['counters']['syntaxAttempts'] == 1
     assert env['counters']['errorsResolvedTotal'] == 2
+    update_counters(env, kind='logic', errors_resolved=0)
+    update_counters(env, kind='runtime', errors_resolved=1)
+    assert env['counters'] == {'totalAttempts': 3, 'syntaxAttempts': 1, 'logicAttempts': 1,
+                               'errorsResolvedTotal': 3}
 
 
 def test_merge_confidence_clamps():
@@ -36,6 +40,8 @@ def test_update_trend_and_breaker_state():
     assert env['trendMetadata']['errorTrend'] == 'improving'
     set_breaker_state(env, 'OPEN')
     assert env['breakerState'] == 'OPEN'
+    set_breaker_state(env, 'BROKEN')
+    assert env['breakerState'] == 'OPEN'
 
 
 def test_cascade_and_resource_usage():
@@ -83,3 +89,93 @@ def test_timeline_entry():
     add_timeline_entry(env, attempt=1, breaker_state='CLOSED', action='continue')
     assert len(env['timeline']) == 1
     assert env['timeline'][0]['attempt'] == 1
+
+
+def test_set_envelope_hash_tracks_direct_writes():
+    env = {}
+    merge_confidence(env, syntax=0.5)
+    set_envelope_hash(env)
+    first = env["envelopeHash"]
+    env["cascadeDepth"] = 5
+    set_envelope_hash(env)
+    assert env["envelopeHash"] != first
+    assert env["envelopeHash"] == compute_stable_envelope_hash(env)
+    assert set(env) == {"confidenceComponents", "cascadeDepth", "envelopeHash"}
+
+
+@pytest.mark.parametrize("ns", [1_700_000_000_123_456_789, 1_700_000_000_000_000_000])
+def test_utc_timestamps_match_datetime_format(monkeypatch, ns):
+    from datetime import datetime, timezone
+    import utils.python.envelope_helpers as helpers
+    monkeypatch.setattr(helpers.time, "time_ns", lambda: ns)
+    expected = datetime.fromtimestamp(ns // 1_000_000_000, timezone.utc).replace(
+        tzinfo=None, microsecond=ns % 1_000_000_000 // 1_000)
+    assert set_envelope_timestamp({})["timestamp"] == expected.isoformat() + "Z"
+    assert append_attempt({}, success=True)["attempts"][0]["ts"] == ns // 1_000_000_000
+
+
+def test_snapshot_envelope_is_independent():
+    from utils.python.envelope_helpers import snapshot_envelope
+    env = {"attempts": [{"ts": 1, "breaker": {"state": "OPEN"}}], "pair": (1, [2]), "n": None}
+    snap = snapshot_envelope(env)
+    assert snap == env
+    env["attempts"][0]["breaker"]["state"] = "CLOSED"
+    env["pair"][1].append(3)
+    assert snap["attempts"][0]["breaker"]["state"] == "OPEN"
+    assert snap["pair"] == (1, [2])
+
+
+def test_history_helpers_keep_most_recent_entries():
+    env = {}
+    for i in range(7):
+        add_timeline_entry(env, attempt=i, max_entries=3)
+        append_attempt(env, success=False, ts=i + 1, max_entries=3)
+    assert [entry['attempt'] for entry in env['timeline']] == [4, 5, 6]
+    assert [entry['ts'] for entry in env['attempts']] == [5, 6, 7]
+    unbounded = {}
+    for i in range(5):
+        add_timeline_entry(unbounded, attempt=i, max_entries=None)
+    assert len(unbounded['timeline']) == 5
+
+
+@pytest.mark.parametrize("value,expected", [
+    (0.25, 0.25), (-0.0, 0.0), (-2.5, 0.0), (7.0, 1.0), (float('inf'), 1.0),
+    (float('nan'), None), (None, None), (1, 1.0), ("0.3", 0.3), ("bad", None),
+])
+def test_clamp01_fast_path_matches_general_path(value, expected):
+    from utils.python.envelope_helpers import _clamp01
+    result = _clamp01(value)
+    assert result == expected and repr(result) == repr(expected)
+
+
+def test_hash_envelopes_matches_single_hashes():
+    from utils.python.envelope_helpers import hash_envelopes
+    envs = [merge_confidence({"patch_id": f"p{i}"}, syntax=i / 10) for i in range(6)]
+    expected = [compute_stable_envelope_hash(env) for env in envs]
+    assert hash_envelopes(envs) == expected
+    assert hash_envelopes(envs, max_workers=3) == expected
+    assert hash_envelopes([]) == []
+
+
+def test_as_envelope_dict_reads_fields_shallowly():
+    from dataclasses import dataclass, field
+    from utils.python.envelope_helpers import as_envelope_dict
+
+    @dataclass(slots=True)
+    class Slotted:
+        patch_id: str
+        attempts: list = field(default_factory=list)
+
+    class Plain:
+        def __init__(self):
+            self.patch_id = "p2"
+
+    env = {"patch_id": "p0"}
+    assert as_envelope_dict(env) is env
+    slotted = Slotted("p1", [{"ts": 1}])
+    as_dict = as_envelope_dict(slotted)
+    assert as_dict == {"patch_id": "p1", "attempts": [{"ts": 1}]}
+    assert as_dict["attempts"] is slotted.attempts
+    assert as_envelope_dict(Plain()) == {"patch_id": "p2"}
+    with pytest.raises(TypeError):
+        as_envelope_dict(42)
@@ -0,0 +1,61 @@
+import sys, os
+ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), '..', '..'))
+if ROOT not in sys.path:
+    sys.path.insert(0, ROOT)
+from utils.python.human_debugging import (
+    MentalSimulationHeuristic, PathAnalysisHeuristic, SeniorDeveloperSimulator
+)
+
+
+def test_path_heuristic_keyword_priority():
+    heuristic = PathAnalysisHeuristic()
+    both = heuristic.analyze_error("Stack OVERFLOW after Undefined constant", {})
+    assert both["analysis"] == "Likely a path resolution issue"
+    assert both["suggested_fixes"] == ("Check file paths", "Use absolute paths", "Verify constants")
+    assert heuristic.analyze_error("buffer overflow", {})["confidence"] == 0.9
+    assert heuristic.analyze_error("boom", {}) == {
+        "heuristic": "PathAnalysis", "analysis": "Unknown pattern", "confidence": 0.1
+    }
+
+
+def test_simulator_maps_best_analysis_to_strategy_and_steps():
+    simulator = SeniorDeveloperSimulator()
+    result = simulator.debug_like_human("Heap overflow", {"code_snippet": "x = 1"})
+    assert result["recommended_strategy"] == "SecurityAuditStrategy"
+    assert result["debugging_steps"][1] == "2. Add logging for buffer sizes and indices"
+
+    result = simulator.debug_like_human("boom", {"code_snippet": "if x: y()"})
+    assert result["primary_analysis"]["heuristic"] == "MentalSimulation"
+    assert result["recommended_strategy"] == "LogAndFixStrategy"
+    assert len(result["debugging_steps"]) == 2
+
+    fallback = simulator.debug_like_human("boom", {})
+    assert fallback["fallback"] == "Use general debugging strategy"
+
+
+def test_heuristic_results_are_shared_read_only_dicts():
+    import json
+    import pytest
+    first = PathAnalysisHeuristic().analyze_error("undefined path", {})
+    assert PathAnalysisHeuristic().analyze_error("UNDEFINED", {}) is first
+    with pytest.raises(TypeError):
+        first["confidence"] = 0.0
+    with pytest.raises(TypeError):
+        first.update(confidence=0.0)
+    assert json.loads(json.dumps(first))["suggested_fixes"] == list(first["suggested_fixes"])
+    assert MentalSimulationHeuristic().analyze_error("", {})["confidence"] == 0.5
+    import copy
+    detached = copy.deepcopy(first)
+    detached["confidence"] = 0.0
+    assert type(detached) is dict and first["confidence"] == 0.8
+
+
+def test_path_findings_dispatch_to_rollback_steps():
+    simulator = SeniorDeveloperSimulator()
+    result = simulator.debug_like_human("Undefined constant", {})
+    assert result["recommended_strategy"] == "RollbackStrategy"
+    steps = result["debugging_steps"]
+    assert steps[1] == "2. Check all file/directory paths for existence"
+    assert len(steps) == 5
+    steps.append("6. extra")  # callers get their own list
+    assert len(simulator.debug_like_human("Undefined constant", {})["debugging_steps"]) == 5
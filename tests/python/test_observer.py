@@ -0,0 +1,163 @@
+import re
+import sys, os
+ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), '..', '..'))
+if ROOT not in sys.path:
+    sys.path.insert(0, ROOT)
+from utils.python.observer import ErrorHandler, Observer, Subject
+
+
+class RecordingObserver(Observer):
+    def __init__(self):
+        self.received = []
+
+    def update(self, subject, data):
+        self.received.append((subject, data))
+
+
+def test_attach_detach_and_notify():
+    subject = Subject()
+    first, second = RecordingObserver(), RecordingObserver()
+    subject.attach(first)
+    subject.attach(first)
+    subject.attach(second)
+    subject.notify({"n": 1})
+    subject.detach(first)
+    subject.detach(first)
+    subject.notify({"n": 2})
+    assert first.received == [(subject, {"n": 1})]
+    assert [data for _, data in second.received] == [{"n": 1}, {"n": 2}]
+
+
+def test_detaching_during_notify_does_not_skip_observers():
+    subject = Subject()
+
+    class DetachingObserver(RecordingObserver):
+        def update(self, subject, data):
+            super().update(subject, data)
+            subject.detach(self)
+
+    leaving, staying = DetachingObserver(), RecordingObserver()
+    subject.attach(leaving)
+    subject.attach(staying)
+    subject.notify({"n": 1})
+    assert len(staying.received) == 1
+    subject.notify({"n": 2})
+    assert len(leaving.received) == 1 and len(staying.received) == 2
+
+
+def test_error_handler_notifies_error_payload():
+    handler = ErrorHandler()
+    observer = RecordingObserver()
+    handler.attach(observer)
+    handler.handle_error("Buffer overflow detected", "security_patch_001")
+    (subject, data), = observer.received
+    assert subject is handler
+    assert data["error"] == "Buffer overflow detected"
+    assert data["patch_name"] == "security_patch_001"
+    assert re.fullmatch(r"\d{4}-\d\d-\d\d \d\d:\d\d:\d\d(\.\d{6})?", data["timestamp"])
+
+
+def test_asynchronous_handler_delivers_in_order_after_flush():
+    handler = ErrorHandler(asynchronous=True, max_batch=4)
+    observer = RecordingObserver()
+
+    class FailingObserver(Observer):
+        def update(self, subject, data):
+            raise RuntimeError("observer bug")
+
+    handler.attach(observer)
+    handler.attach(FailingObserver())  # its errors are reported, delivery continues
+    for i in range(10):
+        handler.handle_error(f"error {i}")
+    handler.flush()
+    assert [data["error"] for _, data in observer.received] == [f"error {i}" for i in range(10)]
+
+
+def test_asynchronous_handler_hands_batches_to_observers():
+    class BatchRecorder(RecordingObserver):
+        def __init__(self):
+            super().__init__()
+            self.batches = []
+
+        def update_batch(self, subject, batch):
+            self.batches.append(list(batch))
+
+    handler = ErrorHandler(asynchronous=True, max_batch=4)
+    recorder = BatchRecorder()
+    handler.attach(recorder)
+    for i in range(10):
+        handler.handle_error(f"error {i}")
+    handler.close()
+    assert all(1 <= len(batch) <= 4 for batch in recorder.batches)
+    assert [data["error"] for batch in recorder.batches for data in batch] == [f"error {i}" for i in range(10)]
+    assert recorder.received == []
+
+    handler.handle_error("after close")  # delivered synchronously
+    assert [data["error"] for _, data in recorder.received] == ["after close"]
+    handler.close()
+
+
+def test_asynchronous_handler_thread_stops_when_collected():
+    import gc
+    import weakref
+    handler = ErrorHandler(asynchronous=True)
+    thread = handler._thread
+    handler_ref = weakref.ref(handler)
+    del handler
+    gc.collect()
+    assert handler_ref() is None
+    thread.join(timeout=5)
+    assert not thread.is_alive()
+
+
+def test_patch_observer_writes_a_batch_once(monkeypatch):
+    import json
+    from utils.python.observer import PatchObserver
+    writes = []
+    monkeypatch.setattr(sys, "stdout", type("Out", (), {"write": lambda self, text: writes.append(text)})())
+    PatchObserver("Sec").update_batch(None, [{"patch_name": "p1"}, {"patch_name": "p2"}])
+    assert len(writes) == 1
+    prefix = "Observer Sec received update: "
+    chunks = writes[0].split(prefix)[1:]
+    assert [json.loads(chunk)["patch_name"] for chunk in chunks] == ["p1", "p2"]
+
+
+def test_patch_observer_output_matches_indented_json(capsys):
+    import json
+    from utils.python.observer import PatchObserver, _dumps_indented
+    for record in [{"a": 1, "b": "x\"ü\n", "c": None, "d": True, "e": 1.5}, {}, {"a": [1]}, {True: "x"}]:
+        assert _dumps_indented(record) == json.dumps(record, indent=2)
+    PatchObserver("Sec").update(None, {"success": True, "patch_name": "p1"})
+    out = capsys.readouterr().out
+    prefix = "Observer Sec received update: "
+    assert out.startswith(prefix) and out.endswith("}\n")
+    assert json.loads(out[len(prefix):]) == {
+        "observer": "Sec", "patch_success": True, "patch_name": "p1", "details": "", "timestamp": ""
+    }
+
+
+def test_observer_and_handlers_are_slotted():
+    from utils.python.observer import PatchObserver
+    assert not hasattr(PatchObserver("p"), "__dict__")
+    assert not hasattr(ErrorHandler(), "__dict__")
+    assert not hasattr(Subject(), "__dict__")
+
+
+def test_attach_uses_identity_not_equality():
+    class EqualToAll(RecordingObserver):
+        def __eq__(self, other):
+            return True
+        __hash__ = object.__hash__
+
+    subject = Subject()
+    first, second = EqualToAll(), EqualToAll()
+    subject.attach(first)
+    subject.attach(second)
+    subject.attach(first)
+    subject.notify({"n": 1})
+    assert first.received == second.received == [(subject, {"n": 1})]
+    subject.detach(second)
+    subject.detach(second)
+    subject.notify({"n": 2})
+    assert [data for _, data in first.received] == [{"n": 1}, {"n": 2}]
+    assert [data for _, data in second.received] == [{"n": 1}]
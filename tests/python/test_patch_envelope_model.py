@@ -1,9 +1,15 @@
 import json
+from datetime import datetime
 
-from utils.python.envelope import PatchEnvelope
+import pytest
+
+from utils.python.envelope import AIPatchEnvelope, MemoryBuffer, PatchEnvelope, _iso_from_ns
 from utils.python.envelope_helpers import (
+    add_timeline_entry,
     append_attempt,
+    compute_stable_envelope_hash,
     mark_success,
+    merge_resource_usage,
     set_envelope_timestamp,
     set_envelope_hash,
 )
@@ -67,3 +73,293 @@ def test_to_json_round_trip():
     assert restored.cascadeDepth == 2
     assert restored.success is True
     assert restored.resourceUsage["cpuPercent"] == 10
+
+
+def test_classify_patch_matches_marker_priority():
+    wrapper = AIPatchEnvelope()
+    assert wrapper._classify_patch({"fix": "noop"}) == (
+        False, "Complex patch detected requiring manual review before deployment."
+    )
+    is_big, message = wrapper._classify_patch({"a": "authentication_bypass", "b": "database_schema_change"})
+    assert is_big and message.startswith("Database schema")
+    assert wrapper._classify_patch({"x": "critical_security_vulnerability"})[1].startswith("Complex patch")
+    assert wrapper._classify_patch({"blob": "x" * 1001})[0] is True
+
+    result = wrapper.unwrap_and_execute(wrapper.wrap_patch({"fix": "production_data_modification"}))
+    assert result["flagged"] is True
+    assert json.loads(result["envelope"])["developer_message"].startswith("Production data")
+
+
+def test_memory_buffer_accepts_envelope_objects_and_json():
+    memory = MemoryBuffer(max_size=2)
+    patch = {"fix": "add bounds check to parser loop"}
+    envelope = make_envelope(patch_data=patch)
+    memory.add_outcome(envelope)
+    memory.add_outcome(envelope.to_json())
+    similar = memory.get_similar_outcomes({"fix": "add bounds check to lexer loop"})
+    assert len(similar) == 2
+    assert all(json.loads(item["envelope"])["patch_data"] == patch for item in similar)
+
+    memory.add_outcome(make_envelope(patch_data={"fix": "noop"}).to_dict())
+    assert len(memory.buffer) == 2
+    assert len(memory.get_similar_outcomes(patch)) == 1
+
+
+def test_memory_buffer_index_matches_linear_scan():
+    words = ["alpha", "beta", "gamma", "delta", "eps", "zeta", "eta"]
+    memory = MemoryBuffer(max_size=6)
+    for i in range(15):
+        fix = " ".join(words[(i + k) % len(words)] for k in range(6))
+        memory.add_outcome(make_envelope(patch_id=f"p{i}", patch_data={"fix": fix}))
+    assert len(memory.buffer) == 6
+
+    query = {"fix": "x beta gamma delta eps y"}
+    query_tokens = MemoryBuffer._tokenize(query)
+    expected = [item for item in memory.buffer
+                if memory._is_similar(MemoryBuffer._tokenize(item["_envelope_obj"]["patch_data"]), query_tokens)][-5:]
+    assert memory.get_similar_outcomes(query) == expected
+    assert expected
+    assert json.loads(json.dumps(expected)) == expected  # records stay JSON-serializable
+
+
+def test_wrap_patch_id_digest_is_content_addressed():
+    wrapper = AIPatchEnvelope()
+    first = wrapper.wrap_patch({"b": 1, "a": "fix"}).patch_id
+    second = AIPatchEnvelope().wrap_patch({"a": "fix", "b": 1}).patch_id
+    other = wrapper.wrap_patch({"a": "fix", "b": 2}).patch_id
+    digest = first.split("_")[2]
+    assert len(digest) == 12
+    assert digest == second.split("_")[2]
+    assert digest != other.split("_")[2]
+
+
+def test_rewrapping_same_patch_keeps_distinct_envelopes():
+    wrapper = AIPatchEnvelope()
+    envelopes = [wrapper.wrap_patch({"fix": "noop"}) for _ in range(3)]
+    ids = [envelope.patch_id for envelope in envelopes]
+    assert len(set(ids)) == 3
+    assert set(wrapper.envelopes) == set(ids)
+
+
+def test_wrapper_tracks_envelopes_only_while_referenced():
+    wrapper = AIPatchEnvelope()
+    kept = wrapper.wrap_patch({"fix": "kept"})
+    wrapper.wrap_patch({"fix": "dropped"})
+    assert list(wrapper.envelopes) == [kept.patch_id]
+    assert not hasattr(wrapper, "__dict__")
+    assert not hasattr(MemoryBuffer(), "__dict__")
+
+
+def test_unwrap_and_execute_stamps_single_timestamp():
+    wrapper = AIPatchEnvelope()
+    envelope = wrapper.wrap_patch({"fix": "noop"})
+    result = wrapper.unwrap_and_execute(envelope)
+    assert json.loads(result["envelope"])["timestamp"] == envelope.to_dict()["timestamp"]
+
+
+def test_unwrap_and_execute_records_success_in_place():
+    wrapper = AIPatchEnvelope()
+    envelope = wrapper.wrap_patch({"fix": "noop"})
+    wrapper.unwrap_and_execute(envelope)
+    assert envelope.success is True
+    assert [a["note"] for a in envelope.attempts] == ["Patch executed successfully"]
+    assert envelope.attempts[0]["breaker"] == {"state": "CLOSED", "failure_count": 0}
+    assert envelope.envelope_hash == compute_stable_envelope_hash(envelope.to_dict())
+
+
+def test_attempt_and_timeline_history_is_bounded():
+    limit = PatchEnvelope.MAX_HISTORY_ENTRIES
+    envelope = make_envelope(attempts=[{"ts": i} for i in range(limit + 5)])
+    assert [a["ts"] for a in envelope.attempts][:1] == [5]
+
+    envelope.add_attempt({"ts": "latest"})
+    assert len(envelope.attempts) == limit
+    assert envelope.attempts[-1]["ts"] == "latest"
+
+    with envelope.mutable_payload() as payload:
+        for i in range(limit + 1):
+            add_timeline_entry(payload, attempt=i)
+    assert len(envelope.timeline) == limit
+    assert envelope.timeline[0]["attempt"] == 1
+
+    restored = PatchEnvelope.from_json(envelope.to_json())
+    assert len(restored.attempts) == limit
+
+
+def test_stable_hash_matches_helper_hash():
+    envelope = make_envelope(
+        patch_data={"fix": "bounds", "lines": [1, 2, 3], "note": "café"},
+        confidenceComponents={"syntax": 0.5},
+        counters={"totalAttempts": 2},
+    )
+    assert envelope.stable_hash() == compute_stable_envelope_hash(envelope.to_dict())
+    envelope.add_attempt({"ts": 1})  # volatile: hash unchanged
+    before = envelope.stable_hash()
+    assert before == compute_stable_envelope_hash(envelope.to_dict())
+    envelope.merge_metadata({"service": "payments"})
+    assert envelope.stable_hash() != before
+    assert envelope.stable_hash() == compute_stable_envelope_hash(envelope.to_dict())
+
+
+def test_mutable_payload_copies_only_changed_keys():
+    envelope = make_envelope(metadata={"nested": {"k": 1}})
+    metadata_before = envelope._data["metadata"]
+    with envelope.mutable_payload() as payload:
+        payload["counters"]["totalAttempts"] = 1
+    assert envelope._data["metadata"] is metadata_before
+    assert envelope.counters == {"totalAttempts": 1}
+    payload["counters"]["totalAttempts"] = 99  # the yielded snapshot stays detached
+    assert envelope.counters == {"totalAttempts": 1}
+
+
+def test_to_json_does_not_alias_or_mutate_payload():
+    envelope = make_envelope()
+    payload = json.loads(envelope.to_json(timestamp="2025-01-01T00:00:00"))
+    assert payload["timestamp"] == "2025-01-01T00:00:00"
+    assert "timestamp" not in envelope.to_dict()
+
+
+def test_memory_buffer_snapshot_is_detached_from_envelope():
+    memory = MemoryBuffer()
+    envelope = make_envelope(patch_data={"fix": "add bounds check now"})
+    memory.add_outcome(envelope)
+    envelope.merge_metadata({"later": True})
+    stored = memory.buffer[0]
+    assert "later" not in stored["_envelope_obj"]["metadata"]
+    assert json.loads(stored["envelope"]) == stored["_envelope_obj"]
+    assert json.loads(envelope.to_json(indent=None, timestamp="t"))["timestamp"] == "t"
+
+
+
+def test_memory_buffer_snapshots_plain_dict_envelopes():
+    memory = MemoryBuffer()
+    payload = make_envelope(patch_data={"fix": "add bounds check now"}).to_dict()
+    payload["success"] = False
+    memory.add_outcome(payload)
+    payload["success"] = True
+    payload["patch_data"]["fix"] = "rewrite"
+    stored = memory.buffer[0]
+    assert json.loads(stored["envelope"]) == stored["_envelope_obj"]
+    assert stored["_envelope_obj"]["success"] is False
+    assert len(memory.get_similar_outcomes({"fix": "add bounds check later"})) == 1
+
+def _reference_json(envelope, timestamp, indent):
+    snapshot = envelope.to_dict(include_timestamp=True, timestamp=timestamp)
+    if indent is None:
+        return json.dumps(snapshot, separators=(",", ":"))
+    return json.dumps(snapshot, indent=indent)
+
+
+@pytest.mark.parametrize("indent", [2, None, 4])
+def test_cached_to_json_matches_fresh_serialization(indent):
+    wrapper = AIPatchEnvelope()
+    envelope = wrapper.wrap_patch({"fix": "noop"})
+    assert envelope.to_json(timestamp="t1", indent=indent) == _reference_json(envelope, "t1", indent)
+    assert envelope.to_json(timestamp="t2", indent=indent) == _reference_json(envelope, "t2", indent)
+
+    envelope.merge_metadata({"service": "payments"})
+    envelope.counters = {"totalAttempts": 3}
+    assert envelope.to_json(timestamp="t3", indent=indent) == _reference_json(envelope, "t3", indent)
+
+    wrapper.unwrap_and_execute(envelope)  # stores a payload timestamp and a hash
+    assert envelope.to_json(timestamp="t4", indent=indent) == _reference_json(envelope, "t4", indent)
+
+    with envelope.mutable_payload() as payload:
+        payload["breakerState"] = "OPEN"
+    assert envelope.to_json(timestamp="t5", indent=indent) == _reference_json(envelope, "t5", indent)
+
+
+def test_wrap_patch_copies_caller_patch_and_fills_defaults():
+    patch = {"fix": "noop", "lines": [1]}
+    envelope = AIPatchEnvelope().wrap_patch(patch)
+    patch["lines"].append(2)
+    assert envelope.patch_data == {"fix": "noop", "lines": [1]}
+    reference = make_envelope(patch_id=envelope.patch_id, patch_data=envelope.patch_data,
+                              metadata=envelope.metadata)
+    assert envelope.to_dict() == reference.to_dict()
+
+
+def test_memory_buffer_short_patches_skip_the_index():
+    memory = MemoryBuffer(max_size=1)
+    memory.add_outcome(make_envelope(patch_data={"x": 1}))  # two tokens: never similar
+    assert memory._postings == {}
+    assert memory.get_similar_outcomes({"x": 1}) == []
+    memory.add_outcome(make_envelope(patch_data={"fix": "one two three"}))
+    assert len(memory.get_similar_outcomes({"fix": "one two three"})) == 1
+
+
+def test_apply_helpers_mutate_in_place_without_aliasing_arguments():
+    envelope = make_envelope()
+    usage = {"cpuPercent": 10, "history": [1]}
+    envelope.apply_helper(merge_resource_usage, usage)
+    usage["history"].append(2)
+    assert envelope.resource_usage == {"cpuPercent": 10, "history": [1]}
+
+    envelope.apply_multiple_helpers(
+        (append_attempt, (), {"success": False, "note": "first"}),
+        (mark_success, (True,), {}),
+    )
+    assert envelope.success is True
+    assert [a["note"] for a in envelope.attempts] == ["first"]
+
+
+def test_apply_helper_rejects_identity_changes():
+    envelope = make_envelope()
+
+    def rename(payload):
+        payload["patch_id"] = "other"
+
+    def swap_patch(payload):
+        payload["patch_data"] = {"fix": "different"}
+
+    with pytest.raises(ValueError):
+        envelope.apply_helper(rename)
+    with pytest.raises(ValueError):
+        envelope.apply_helper(swap_patch)
+    assert envelope.patch_id == "patch_123"
+    assert envelope.patch_data == {"fix": "noop"}
+
+
+def test_apply_helper_rejects_in_place_patch_data_edits():
+    envelope = PatchEnvelope(patch_id="p", patch_data={"a": 1})
+    with pytest.raises(ValueError):
+        envelope.apply_helper(lambda payload: payload["patch_data"].__setitem__("a", 2))
+    assert envelope.patch_data == {"a": 1}
+    assert envelope.stable_hash() == compute_stable_envelope_hash(envelope.to_dict())
+
+
+@pytest.mark.parametrize("ns", [1_700_000_000_123_456_789, 1_700_000_000_000_000_000, 1_700_000_001_000_999_999])
+def test_iso_timestamps_match_datetime_isoformat(ns):
+    expected = datetime.fromtimestamp(ns // 1_000_000_000).replace(microsecond=ns % 1_000_000_000 // 1_000)
+    assert _iso_from_ns(ns) == expected.isoformat()
+
+
+def test_memory_buffer_tokens_are_structural_words():
+    patch = {"Fix": "Add bounds-check", "lines": [10, {"done": True}], "note": None}
+    assert MemoryBuffer._tokenize(patch) == {
+        "fix", "add", "bounds", "check", "lines", "10", "done", "true", "note", "null"
+    }
+
+
+def test_flat_records_are_copied_independently():
+    envelope = make_envelope()
+    attempt = {"success": True, "note": "ok", "failure_count": 0}
+    nested = {"success": False, "details": {"lines": [1, 2]}}
+    envelope.add_attempt(attempt)
+    envelope.add_attempt(nested)
+    attempt["note"] = "changed"
+    nested["details"]["lines"].append(3)
+    assert envelope.attempts == [
+        {"success": True, "note": "ok", "failure_count": 0},
+        {"success": False, "details": {"lines": [1, 2]}},
+    ]
+
+
+def test_streamed_helper_hash_matches_canonical_dump():
+    import hashlib
+    from utils.python.envelope_helpers import VOLATILE_KEYS, json_dumps_stable
+    env = make_envelope(patch_data={"fix": "ü", "n": [1, 2.5, None]}).to_dict(include_timestamp=True)
+    canonical = json_dumps_stable({k: v for k, v in env.items() if k not in VOLATILE_KEYS})
+    expected = hashlib.sha256(canonical.encode("utf-8")).hexdigest()
+    assert compute_stable_envelope_hash(env) == expected
+    assert compute_stable_envelope_hash({"attempts": []}) == hashlib.sha256(b"{}").hexdigest()
@@ -0,0 +1,50 @@
+import sys, os
+ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), '..', '..'))
+if ROOT not in sys.path:
+    sys.path.insert(0, ROOT)
+from utils.python.strategy import LogAndFixStrategy, RollbackStrategy, SecurityAuditStrategy
+
+
+def test_outcomes_keep_shape_and_key_order():
+    assert list(LogAndFixStrategy().execute({"error": "E"}).items()) == [
+        ("strategy", "LogAndFixStrategy"),
+        ("error", "E"),
+        ("fix", "Logged and fixed: E"),
+        ("success", True),
+        ("details", "Error logged and basic fix applied"),
+    ]
+    assert list(RollbackStrategy().execute({"error": "E"}).items()) == [
+        ("strategy", "RollbackStrategy"),
+        ("error", "E"),
+        ("rollback_action", "Rolled back changes due to: E"),
+        ("success", True),
+        ("details", "Changes rolled back to previous stable state"),
+    ]
+    assert list(SecurityAuditStrategy().execute({"vulnerability": "V"}).items()) == [
+        ("strategy", "SecurityAuditStrategy"),
+        ("vulnerability", "V"),
+        ("audit_result", "Security audit passed for: V"),
+        ("success", True),
+        ("details", "Security vulnerability addressed"),
+    ]
+
+
+def test_outcomes_are_independent_of_the_template():
+    strategy = LogAndFixStrategy()
+    first = strategy.execute({"error": "a"})
+    first["success"] = False
+    second = strategy.execute({})
+    assert second["success"] is True
+    assert second["error"] == ""
+    assert LogAndFixStrategy._TEMPLATE["fix"] == ""
+
+
+def test_debugger_dispatches_to_current_strategy():
+    from utils.python.strategy import Debugger
+    debugger = Debugger(LogAndFixStrategy())
+    assert debugger.debug({"error": "E"})["strategy"] == "LogAndFixStrategy"
+    debugger.set_strategy(RollbackStrategy())
+    assert isinstance(debugger._strategy, RollbackStrategy)
+    assert debugger.debug({"error": "E"})["strategy"] == "RollbackStrategy"
+    assert not hasattr(debugger, "__dict__")
+    assert not hasattr(RollbackStrategy(), "__dict__")
@@ -3,16 +3,32 @@ from abc import ABC, abstractmethod
 from typing import Dict, Any
 
 class Target(ABC):
+    __slots__ = ()
+
     @abstractmethod
     def apply_patch(self, patch_data: Dict[str, Any]) -> Dict[str, Any]:
         pass
 
 class Adaptee:
+    __slots__ = ()
+
     def legacy_patch(self, raw_patch: str) -> str:
         # Simulate a legacy patching system
         return f"Legacy patched: {raw_patch}"
 
 class PatchAdapter(Target):
+    __slots__ = ("adaptee",)
+
+    # Constant keys prebuilt once; per-call values are filled in on a copy (key order preserved)
+    _OUTCOME_TEMPLATE: Dict[str, Any] = {
+        "adapter": "PatchAdapter",
+        "patch_applied": True,
+        "original_patch": None,
+        "adapted_result": None,
+        "success": True,
+        "details": "Patch adapted and applied successfully"
+    }
+
     def __init__(self, adaptee: Adaptee):
         self.adaptee = adaptee
 
@@ -22,17 +38,24 @@ class PatchAdapter(Target):
         adapted_result = self.adaptee.legacy_patch(raw_patch)
 
         # Create JSON outcome
-        outcome = {
-            "adapter": "PatchAdapter",
-            "patch_applied": True,
-            "original_patch": patch_data,
-            "adapted_result": adapted_result,
-            "success": True,
-            "details": "Patch adapted and applied successfully"
-        }
+        outcome = self._OUTCOME_TEMPLATE.copy()
+        outcome["original_patch"] = patch_data
+        outcome["adapted_result"] = adapted_result
         return outcome
 
 class SecurityPatchAdapter(Target):
+    __slots__ = ()
+
+    _OUTCOME_TEMPLATE: Dict[str, Any] = {
+        "adapter": "SecurityPatchAdapter",
+        "patch_applied": True,
+        "vulnerability": None,
+        "fix": None,
+        "result": None,
+        "success": True,
+        "details": "Security patch applied successfully"
+    }
+
     def apply_patch(self, patch_data: Dict[str, Any]) -> Dict[str, Any]:
         # Simulate security patch application
         vulnerability = patch_data.get("vulnerability", "")
@@ -41,15 +64,10 @@ class SecurityPatchAdapter(Target):
         # Apply security fix
         result = f"Security fix applied for {vulnerability}: {fix}"
 
-        outcome = {
-            "adapter": "SecurityPatchAdapter",
-            "patch_applied": True,
-            "vulnerability": vulnerability,
-            "fix": fix,
-            "result": result,
-            "success": True,
-            "details": "Security patch applied successfully"
-        }
+        outcome = self._OUTCOME_TEMPLATE.copy()
+        outcome["vulnerability"] = vulnerability
+        outcome["fix"] = fix
+        outcome["result"] = result
         return outcome
 
 # Usage example
@@ -59,10 +77,10 @@ if __name__ == "__main__":
 
     patch_data = {"raw_patch": "Fix buffer overflow"}
     result = adapter.apply_patch(patch_data)
-    print(json.dumps(result, indent=2))
+    print(json.dumps(result, separators=(",", ":")))
 
     # Security adapter
     security_adapter = SecurityPatchAdapter()
     security_patch = {"vulnerability": "SQL Injection", "fix": "Use prepared statements"}
     security_result = security_adapter.apply_patch(security_patch)
-    print(json.dumps(security_result, indent=2))
\ No newline at end of file
+    print(json.dumps(security_result, separators=(",", ":")))
\ No newline at end of file
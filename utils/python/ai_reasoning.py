@@ -1,38 +1,69 @@
 import json
-from typing import Dict, Any, List
-from collections import defaultdict
+from typing import Dict, Any, List, Optional
+from collections import defaultdict, deque
+from datetime import datetime
 
 class PatternLearner:
     def __init__(self):
         self.patterns = defaultdict(lambda: {"success_count": 0, "failure_count": 0, "avg_time": 0})
+        # Success rate per pattern, refreshed on every learn_from_outcome
+        self._success_rates: Dict[str, float] = {}
     
     def learn_from_outcome(self, pattern_type: str, success: bool, execution_time: float):
-        self.patterns[pattern_type]["success_count" if success else "failure_count"] += 1
-        # Update rolling average
-        current_avg = self.patterns[pattern_type]["avg_time"]
-        count = self.patterns[pattern_type]["success_count"] + self.patterns[pattern_type]["failure_count"]
-        self.patterns[pattern_type]["avg_time"] = (current_avg * (count - 1) + execution_time) / count
+        stats = self.patterns[pattern_type]
+        stats["success_count" if success else "failure_count"] += 1
+        count = stats["success_count"] + stats["failure_count"]
+        # Incremental rolling average (no re-multiplication drift)
+        stats["avg_time"] += (execution_time - stats["avg_time"]) / count
+        self._success_rates[pattern_type] = stats["success_count"] / count
+    
+    def get_success_rate(self, pattern_type: str) -> Optional[float]:
+        """Cached success rate, or None if the pattern has no recorded outcomes"""
+        return self._success_rates.get(pattern_type)
     
     def get_best_pattern(self, available_patterns: List[str]) -> str:
-        best_pattern = max(available_patterns, 
-                          key=lambda p: self.patterns[p]["success_count"] / 
-                                        max(1, self.patterns[p]["success_count"] + self.patterns[p]["failure_count"]))
-        return best_pattern
+        rates = self._success_rates
+        return max(available_patterns, key=lambda p: rates.get(p, 0.0))
     
     def get_pattern_stats(self) -> Dict[str, Any]:
         return dict(self.patterns)
 
 class AIReasoningEngine:
-    def __init__(self, learner: PatternLearner, memory_buffer=None):
+    AVAILABLE_STRATEGIES = ("LogAndFixStrategy", "RollbackStrategy", "SecurityAuditStrategy")
+    # Failure fingerprints, checked in order: (truthy flag paths in the envelope, label).
+    # Each path is a tuple of nested keys; new fingerprints are added here, not as new ifs.
+    FAILURE_FINGERPRINTS = (
+        ((("flagged_for_developer",),), "Flagged for developer - complex issue"),
+        ((("circuit_breaker_tripped",), ("simulation_details", "circuit_breaker_tripped")),
+         "Circuit breaker tripped - potential infinite loop"),
+    )
+    
+    def __init__(self, learner: PatternLearner, memory_buffer=None, max_decision_log: int = 1024):
         self.learner = learner
         self.memory_buffer = memory_buffer
-        self.decision_log = []
+        # Ring buffer: keep only the most recent decisions
+        self.decision_log = deque(maxlen=max_decision_log)
     
     def reason_about_patch(self, context: Dict[str, Any]) -> Dict[str, Any]:
-        error_type = context.get("error_type", "unknown")
-        available_strategies = ["LogAndFixStrategy", "RollbackStrategy", "SecurityAuditStrategy"]
+        best_strategy = self.learner.get_best_pattern(self.AVAILABLE_STRATEGIES)
+        return self._reason(context, best_strategy, self._calculate_confidence(best_strategy),
+                            self.learner.get_pattern_stats())
+    
+    def reason_batch(self, contexts: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+        """Reason about many contexts at once (e.g. when replaying logs).
         
-        best_strategy = self.learner.get_best_pattern(available_strategies)
+        The learner is not updated while a batch is reasoned about, so the
+        strategy ranking, its confidence and the pattern stats are computed
+        once and shared by every context in the batch.
+        """
+        best_strategy = self.learner.get_best_pattern(self.AVAILABLE_STRATEGIES)
+        confidence = self._calculate_confidence(best_strategy)
+        stats = self.learner.get_pattern_stats()
+        return [self._reason(context, best_strategy, confidence, stats) for context in contexts]
+    
+    def _reason(self, context: Dict[str, Any], best_strategy: str, confidence: float,
+                stats: Dict[str, Any]) -> Dict[str, Any]:
+        error_type = context.get("error_type", "unknown")
         
         # Check memory buffer for similar past outcomes
         similar_outcomes = []
@@ -41,10 +72,10 @@ class AIReasoningEngine:
         
         reasoning = {
             "error_analysis": f"Detected {error_type} error",
-            "historical_performance": self.learner.get_pattern_stats(),
+            "historical_performance": stats,
             "recommended_strategy": best_strategy,
-            "confidence": self._calculate_confidence(best_strategy),
-            "alternative_strategies": [s for s in available_strategies if s != best_strategy],
+            "confidence": confidence,
+            "alternative_strategies": [s for s in self.AVAILABLE_STRATEGIES if s != best_strategy],
             "similar_past_outcomes": len(similar_outcomes),
             "learning_insights": self._extract_insights(similar_outcomes)
         }
@@ -52,45 +83,60 @@ class AIReasoningEngine:
         self.decision_log.append({
             "context": context,
             "reasoning": reasoning,
-            "timestamp": __import__('datetime').datetime.now().isoformat()
+            "timestamp": datetime.now().isoformat()
         })
         
         return reasoning
     
     def _calculate_confidence(self, strategy: str) -> float:
-        stats = self.learner.patterns[strategy]
-        total = stats["success_count"] + stats["failure_count"]
-        if total == 0:
+        success_rate = self.learner.get_success_rate(strategy)
+        if success_rate is None:
             return 0.5  # Neutral confidence for new strategies
-        return stats["success_count"] / total
+        return success_rate
+    
+    @staticmethod
+    def _parsed_envelope(outcome: Dict[str, Any]) -> Dict[str, Any]:
+        """Decode an outcome's envelope JSON, memoized on the outcome record"""
+        parsed = outcome.get("_envelope_obj")
+        if parsed is None:
+            parsed = outcome["_envelope_obj"] = json.loads(outcome["envelope"])
+        return parsed
     
     def _extract_insights(self, similar_outcomes: List[Dict[str, Any]]) -> Dict[str, Any]:
         """Extract learning insights from similar past outcomes"""
         if not similar_outcomes:
             return {"insights": "No similar past outcomes found"}
         
-        success_rate = sum(1 for outcome in similar_outcomes 
-                          if json.loads(outcome["envelope"]).get("success", False)) / len(similar_outcomes)
+        # Single pass: success count and failure patterns from one decode per outcome
+        success_count = 0
+        failure_patterns: set = set()
+        for outcome in similar_outcomes:
+            envelope_data = self._parsed_envelope(outcome)
+            if envelope_data.get("success", False):
+                success_count += 1
+                continue
+            pattern = self._failure_pattern(envelope_data)
+            if pattern:
+                failure_patterns.add(pattern)  # set dedupes as we go
+        success_rate = success_count / len(similar_outcomes)
         
         return {
             "success_rate_in_similar_cases": success_rate,
             "recommendation": "Proceed with caution" if success_rate < 0.7 else "High confidence",
-            "patterns_to_avoid": self._identify_failure_patterns(similar_outcomes)
+            "patterns_to_avoid": list(failure_patterns)
         }
     
-    def _identify_failure_patterns(self, outcomes: List[Dict[str, Any]]) -> List[str]:
-        """Identify common failure patterns from past outcomes"""
-        failure_patterns = []
-        for outcome in outcomes:
-            envelope_data = json.loads(outcome["envelope"])
-            if not envelope_data.get("success", False):
-                # Extract failure reasons
-                if envelope_data.get("flagged_for_developer"):
-                    failure_patterns.append("Flagged for developer - complex issue")
-                elif "circuit_breaker_tripped" in str(envelope_data):
-                    failure_patterns.append("Circuit breaker tripped - potential infinite loop")
-        
-        return list(set(failure_patterns))  # Remove duplicates
+    @classmethod
+    def _failure_pattern(cls, envelope_data: Dict[str, Any]) -> Optional[str]:
+        """Classify the failure reason of a parsed, unsuccessful envelope"""
+        for paths, label in cls.FAILURE_FINGERPRINTS:
+            for path in paths:
+                node: Any = envelope_data
+                for key in path:
+                    node = node.get(key) if isinstance(node, dict) else None
+                if node:
+                    return label
+        return None
 
 # Enhanced Strategy with AI reasoning and memory
 class AIEnhancedStrategy(DebuggingStrategy):
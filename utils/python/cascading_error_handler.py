@@ -3,12 +3,26 @@ Cascading Error Handler and Sandbox Environment for Self-Healing Code
 Handles error type transitions and provides safe testing environment
 """
 
-from typing import Dict, List, Optional, Any, Tuple
+from typing import IO, Dict, List, Optional, Any, Tuple
+from collections import Counter
 from enum import Enum
 from dataclasses import dataclass, asdict
 from datetime import datetime
 import json
 
+# Error severity ranking used for escalation detection (unknown types rank lowest)
+SEVERITY_LEVELS = {
+    "syntax": 1,
+    "logic": 2,
+    "runtime": 3,
+    "performance": 4,
+    "security": 5
+}
+
+# Sandbox test suite, in execution order, and the simulated per-test duration
+_TEST_TYPES: Tuple[str, ...] = ("syntax", "unit", "integration", "performance", "security")
+_PER_TEST_MS = 100 + (len(_TEST_TYPES) * 50)
+
 class Environment(Enum):
     SANDBOX = "sandbox"
     PRODUCTION = "production"
@@ -24,6 +38,17 @@ class ResourceLimits:
     max_memory_mb: int = 500
     max_cpu_percent: int = 80
 
+@dataclass(slots=True)
+class ErrorChainEntry:
+    """One link in a cascading error chain"""
+    error_type: str
+    error_message: str
+    confidence_score: float
+    attempt_number: int
+    timestamp: str
+    is_cascading: bool
+    severity: int
+
 @dataclass
 class TestResult:
     test_type: str  # syntax, unit, integration, performance, security
@@ -41,10 +66,15 @@ class SandboxExecution:
                  isolation_level: IsolationLevel = IsolationLevel.FULL,
                  resource_limits: Optional[ResourceLimits] = None):
 
-        self.environment = environment
-        self.isolation_level = isolation_level
+        # Accept enum members or their string values ("full", "sandbox", ...)
+        self.environment = Environment(environment)
+        self.isolation_level = IsolationLevel(isolation_level)
+        # String forms cached once for the result/summary dicts
+        self._environment_str: str = self.environment.value
+        self._isolation_str: str = self.isolation_level.value
         self.resource_limits = resource_limits or ResourceLimits()
         self.test_results: List[TestResult] = []
+        self._tests_passed: int = 0  # tallied by _run_test_suite
         self.start_time: Optional[datetime] = None
         self.end_time: Optional[datetime] = None
 
@@ -59,7 +89,38 @@ class SandboxExecution:
             Execution results with safety metrics
         """
 
+        return self._execute(patch_data, None)
+
+    def batch_execute(self, patches: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+        """
+        Execute several patches, running the simulated test suite once per
+        distinct outcome instead of once per patch
+
+        Simulated verdicts depend only on len(patched_code) modulo 105 (the
+        lcm of the test moduli), so patches in the same residue class share
+        one verdict table.
+
+        Args:
+            patches: Patch data dicts from transmission schema
+
+        Returns:
+            One execution result per patch, in input order
+        """
+
+        verdict_cache: Dict[int, Dict[str, bool]] = {}
+        results = []
+        for patch_data in patches:
+            key = len(patch_data.get("patched_code", "")) % 105
+            verdicts = verdict_cache.get(key)
+            if verdicts is None:
+                verdicts = verdict_cache[key] = self._simulate_tests(patch_data)
+            results.append(self._execute(patch_data, verdicts))
+        return results
+
+    def _execute(self, patch_data: Dict[str, Any], verdicts: Optional[Dict[str, bool]]) -> Dict[str, Any]:
+        """Shared body of execute_patch/batch_execute"""
         self.test_results = []
+        self._tests_passed = 0
         self.start_time = datetime.now()
         self.end_time = None
 
@@ -77,7 +138,7 @@ class SandboxExecution:
                 result = self._execute_without_isolation(patch_data)
 
             # Run comprehensive tests
-            self._run_test_suite(patch_data, result)
+            self._run_test_suite(patch_data, result, verdicts)
 
             result["test_results"] = [asdict(tr) for tr in self.test_results]
 
@@ -133,48 +194,43 @@ class SandboxExecution:
             "test_results": []
         }
 
-    def _run_test_suite(self, patch_data: Dict[str, Any], execution_result: Dict[str, Any]) -> None:
+    def _run_test_suite(self, patch_data: Dict[str, Any], execution_result: Dict[str, Any],
+                        verdicts: Optional[Dict[str, bool]] = None) -> None:
         """Run comprehensive test suite"""
-        test_types = ["syntax", "unit", "integration", "performance", "security"]
+        if verdicts is None:
+            verdicts = self._simulate_tests(patch_data)
 
-        for test_type in test_types:
+        for test_type in _TEST_TYPES:
             # Simulate test execution
-            passed = self._simulate_test(test_type, patch_data)
-            execution_time = 100 + (len(test_types) * 50)  # Variable execution time
+            passed = verdicts[test_type]
+            self._tests_passed += passed
 
             self.test_results.append(TestResult(
                 test_type=test_type,
                 passed=passed,
-                execution_time_ms=execution_time,
+                execution_time_ms=_PER_TEST_MS,
                 error_message="" if passed else f"{test_type} test failed"
             ))
 
-    def _simulate_test(self, test_type: str, patch_data: Dict[str, Any]) -> bool:
+    def _simulate_tests(self, patch_data: Dict[str, Any]) -> Dict[str, bool]:
         """Simulate test execution (in real implementation, this would run actual tests)"""
-        # Simple simulation - in reality, this would execute actual test suites
-        if test_type == "syntax":
-            # Syntax tests usually pass if code compiles
-            return True
-        elif test_type == "unit":
-            # Unit tests might fail occasionally
-            return len(patch_data.get("patched_code", "")) % 3 != 0
-        elif test_type == "integration":
-            # Integration tests more likely to fail
-            return len(patch_data.get("patched_code", "")) % 5 != 0
-        elif test_type == "performance":
-            # Performance tests usually pass
-            return True
-        elif test_type == "security":
-            # Security tests might flag issues
-            return len(patch_data.get("patched_code", "")) % 7 != 0
-        return True
+        # Simple simulation - in reality, this would execute actual test suites.
+        # Every verdict depends only on the patched code length, so measure it once.
+        code_length = len(patch_data.get("patched_code", ""))
+        return {
+            "syntax": True,                       # Syntax tests usually pass if code compiles
+            "unit": code_length % 3 != 0,         # Unit tests might fail occasionally
+            "integration": code_length % 5 != 0,  # Integration tests more likely to fail
+            "performance": True,                  # Performance tests usually pass
+            "security": code_length % 7 != 0,     # Security tests might flag issues
+        }
 
     def _create_failure_result(self, error_message: str) -> Dict[str, Any]:
         """Create failure result with error details"""
         return {
             "success": False,
             "error_message": error_message,
-            "isolation_level": self.isolation_level.value,
+            "isolation_level": self._isolation_str,
             "execution_time_ms": 0,
             "memory_used_mb": 0,
             "cpu_used_percent": 0,
@@ -188,12 +244,12 @@ class SandboxExecution:
         if self.start_time and self.end_time:
             total_time = (self.end_time - self.start_time).total_seconds() * 1000
 
-        passed_tests = sum(1 for test in self.test_results if test.passed)
+        passed_tests = self._tests_passed
         total_tests = len(self.test_results)
 
         return {
-            "environment": self.environment.value,
-            "isolation_level": self.isolation_level.value,
+            "environment": self._environment_str,
+            "isolation_level": self._isolation_str,
             "total_execution_time_ms": total_time,
             "tests_passed": passed_tests,
             "tests_total": total_tests,
@@ -212,9 +268,16 @@ class CascadingErrorHandler:
     """
 
     def __init__(self):
-        self.error_chain: List[Dict[str, Any]] = []
+        self.error_chain: List[ErrorChainEntry] = []
         self.max_cascade_depth: int = 5
         self.max_attempts_per_error: int = 3
+        self._reset_aggregates()
+
+    def _reset_aggregates(self) -> None:
+        """Running cascade statistics, updated on every add_error_to_chain"""
+        self._type_counts: Counter = Counter()
+        self._confidence_sum: float = 0.0
+        self._analysis_cache: Optional[Dict[str, Any]] = None
 
     def add_error_to_chain(self,
                           error_type: str,
@@ -231,16 +294,20 @@ class CascadingErrorHandler:
             attempt_number: Which attempt this was for this error type
         """
 
-        error_entry = {
-            "error_type": error_type,
-            "error_message": error_message,
-            "confidence_score": confidence_score,
-            "attempt_number": attempt_number,
-            "timestamp": datetime.now().isoformat(),
-            "is_cascading": len(self.error_chain) > 0
-        }
+        error_entry = ErrorChainEntry(
+            error_type=error_type,
+            error_message=error_message,
+            confidence_score=confidence_score,
+            attempt_number=attempt_number,
+            timestamp=datetime.now().isoformat(),
+            is_cascading=len(self.error_chain) > 0,
+            severity=SEVERITY_LEVELS.get(error_type, 1)
+        )
 
         self.error_chain.append(error_entry)
+        self._type_counts[error_type] += 1
+        self._confidence_sum += confidence_score
+        self._analysis_cache = None
 
     def should_stop_attempting(self) -> Tuple[bool, str]:
         """
@@ -277,75 +344,75 @@ class CascadingErrorHandler:
             return False
 
         recent_errors = self.error_chain[-3:]
-        error_types = [entry["error_type"] for entry in recent_errors]
+        error_types = [entry.error_type for entry in recent_errors]
 
         # Check if all recent errors are the same type
         return len(set(error_types)) == 1
 
     def _has_degrading_confidence(self) -> bool:
         """Check if confidence scores are consistently decreasing"""
-        if len(self.error_chain) < 3:
+        chain = self.error_chain
+        if len(chain) < 3:
             return False
 
-        recent_scores = [entry["confidence_score"] for entry in self.error_chain[-3:]]
-        return recent_scores[0] > recent_scores[1] > recent_scores[2]
+        # Chained comparison short-circuits on the first non-decreasing pair
+        return chain[-3].confidence_score > chain[-2].confidence_score > chain[-1].confidence_score
 
     def _has_error_escalation(self) -> bool:
         """Check if error severity is increasing"""
-        if len(self.error_chain) < 2:
+        chain = self.error_chain
+        if len(chain) < 2:
             return False
 
-        severity_levels = {
-            "syntax": 1,
-            "logic": 2,
-            "runtime": 3,
-            "performance": 4,
-            "security": 5
-        }
-
-        recent_severities = []
-        for entry in self.error_chain[-3:]:
-            error_type = entry["error_type"]
-            severity = severity_levels.get(error_type, 1)
-            recent_severities.append(severity)
-
-        # Check if severity is consistently increasing
-        return (len(recent_severities) >= 2 and
-                recent_severities[-1] > recent_severities[-2])
+        # Severity is stamped on each entry in add_error_to_chain
+        return chain[-1].severity > chain[-2].severity
 
     def get_cascade_analysis(self) -> Dict[str, Any]:
         """Get analysis of the current error cascade"""
+        analysis = self._cascade_analysis()
+        if analysis is not self._analysis_cache:
+            return analysis  # the empty-cascade result is built fresh on each call
+        # Callers get their own copy, so the cached analysis cannot be altered
+        return {**analysis, "error_type_distribution": dict(analysis["error_type_distribution"])}
+
+    def _cascade_analysis(self) -> Dict[str, Any]:
+        """Shared, read-only cascade analysis; use get_cascade_analysis for a copy"""
         if len(self.error_chain) == 0:
             return {"cascade_depth": 0, "analysis": "No errors in cascade"}
 
-        # Analyze error types frequency
-        error_type_counts = {}
-        for entry in self.error_chain:
-            error_type = entry["error_type"]
-            error_type_counts[error_type] = error_type_counts.get(error_type, 0) + 1
+        # Reuse the analysis until the next add_error_to_chain invalidates it
+        if self._analysis_cache is not None:
+            return self._analysis_cache
 
-        # Analyze confidence trend
-        confidence_scores = [entry["confidence_score"] for entry in self.error_chain]
+        # Analyze confidence trend (first vs latest entry)
+        first_confidence = self.error_chain[0].confidence_score
+        last_confidence = self.error_chain[-1].confidence_score
         confidence_trend = "stable"
-        if len(confidence_scores) >= 2:
-            if confidence_scores[-1] > confidence_scores[0]:
-                confidence_trend = "improving"
-            elif confidence_scores[-1] < confidence_scores[0]:
-                confidence_trend = "degrading"
-
-        return {
-            "cascade_depth": len(self.error_chain),
-            "error_type_distribution": error_type_counts,
+        if last_confidence > first_confidence:
+            confidence_trend = "improving"
+        elif last_confidence < first_confidence:
+            confidence_trend = "degrading"
+
+        cascade_depth = len(self.error_chain)
+        analysis = {
+            "cascade_depth": cascade_depth,
+            "error_type_distribution": dict(self._type_counts),
             "confidence_trend": confidence_trend,
-            "average_confidence": sum(confidence_scores) / len(confidence_scores),
-            "most_common_error": max(error_type_counts, key=error_type_counts.get),
-            "recommendation": self._generate_recommendation()
+            "average_confidence": self._confidence_sum / cascade_depth,
+            "most_common_error": self._type_counts.most_common(1)[0][0],
         }
+        analysis["recommendation"] = self._recommend_from(analysis)
+        self._analysis_cache = analysis
+        return analysis
 
     def _generate_recommendation(self) -> str:
         """Generate recommendation based on cascade analysis"""
-        analysis = self.get_cascade_analysis()
+        return self._cascade_analysis().get(
+            "recommendation", "Continue with caution - monitor for further cascades"
+        )
 
+    def _recommend_from(self, analysis: Dict[str, Any]) -> str:
+        """Map an already-computed cascade analysis to a recommendation"""
         if analysis["cascade_depth"] >= self.max_cascade_depth:
             return "Stop attempting fixes - cascade depth limit reached"
 
@@ -369,11 +436,19 @@ class CascadingErrorHandler:
     def reset_cascade(self) -> None:
         """Reset the error cascade (use when starting fresh attempt)"""
         self.error_chain = []
+        self._reset_aggregates()
 
     def get_error_chain_json(self) -> str:
         """Get the error chain as JSON for transmission"""
-        return json.dumps({
-            "error_chain": self.error_chain,
+        return json.dumps(self._error_chain_payload(), indent=2)
+
+    def dump_error_chain_json(self, fp: IO[str]) -> None:
+        """Stream the error chain as compact JSON to a text file-like sink (telemetry path)"""
+        json.dump(self._error_chain_payload(), fp, separators=(",", ":"))
+
+    def _error_chain_payload(self) -> Dict[str, Any]:
+        return {
+            "error_chain": [asdict(entry) for entry in self.error_chain],
             "cascade_analysis": self.get_cascade_analysis(),
             "timestamp": datetime.now().isoformat()
-        }, indent=2)
\ No newline at end of file
+        }
\ No newline at end of file
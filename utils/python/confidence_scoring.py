@@ -4,6 +4,9 @@ Provides consistent confidence scoring across all languages with error classific
 """
 
 import math
+from collections import deque
+from functools import lru_cache
+from operator import attrgetter
 from typing import Dict, List, Optional, Tuple, Any
 from dataclasses import dataclass
 from enum import Enum
@@ -28,14 +31,40 @@ class CircuitState(Enum):
     LOGIC_OPEN = "logic_open"
     PERMANENTLY_OPEN = "permanently_open"
 
-@dataclass
+# Error types handled by the logic (more forgiving) path
+_LOGIC_TYPES = frozenset({ErrorType.LOGIC, ErrorType.RUNTIME})
+
+# should_attempt_fix: error type -> (confidence accessor, threshold)
+_FIX_THRESHOLDS = {
+    ErrorType.SYNTAX: (attrgetter("syntax_confidence"), 0.95),  # Syntax errors need very high confidence (>95%)
+    ErrorType.LOGIC: (attrgetter("logic_confidence"), 0.80),  # Logic errors can proceed with lower confidence (>80%)
+    ErrorType.RUNTIME: (attrgetter("logic_confidence"), 0.80),
+}
+_DEFAULT_FIX_THRESHOLD = (attrgetter("overall_confidence"), 0.85)  # Other errors use overall confidence (>85%)
+
+@lru_cache(maxsize=1024)
+def _softmax_cached(logits: Tuple[float, ...], temperature: float = 1.0) -> Tuple[float, ...]:
+    """Temperature-scaled, max-stabilized softmax over a hashable logit vector;
+    repeated (logits, temperature) pairs hit the cache"""
+    if not logits:
+        return ()
+    if temperature != 1.0:
+        logits = tuple(logit / temperature for logit in logits)
+    max_logit = max(logits)
+    exp_logits = [math.exp(logit - max_logit) for logit in logits]
+    sum_exp = sum(exp_logits)
+    if sum_exp == 0:
+        return tuple(0.0 for _ in exp_logits)
+    return tuple(exp_logit / sum_exp for exp_logit in exp_logits)
+
+@dataclass(slots=True)
 class ConfidenceComponents:
     historical_success_rate: float = 0.5
     pattern_similarity: float = 0.5
     code_complexity_penalty: float = 1.0
     test_coverage: float = 0.5
 
-@dataclass
+@dataclass(slots=True)
 class ConfidenceScore:
     overall_confidence: float
     syntax_confidence: float
@@ -56,7 +85,9 @@ class UnifiedConfidenceScorer:
     def __init__(self, temperature: float = 1.0, calibration_samples: int = 1000):
         self.temperature = temperature
         self.calibration_samples = calibration_samples
-        self.historical_scores: List[Tuple[float, bool]] = []  # (confidence, was_correct)
+        # (confidence, was_correct), bounded to the most recent calibration_samples
+        self.historical_scores: deque = deque(maxlen=calibration_samples)
+        self._correct_count = 0  # running count of was_correct in historical_scores
 
     def calculate_confidence(self,
                            logits: List[float],
@@ -74,62 +105,103 @@ class UnifiedConfidenceScorer:
             ConfidenceScore with calibrated confidence values
         """
 
-        # Apply temperature scaling
-        scaled_logits = [logit / self.temperature for logit in logits]
+        # A batch of one: the single and batch paths share one pipeline
+        return self.calculate_confidence_batch(logits, error_type, [historical_data])[0]
 
-        # Calculate probabilities using softmax
-        probabilities = self._softmax(scaled_logits)
+    def calculate_confidence_batch(self,
+                                   logits: List[float],
+                                   error_type: ErrorType,
+                                   historical_batch: List[Optional[Dict[str, Any]]]) -> List[ConfidenceScore]:
+        """
+        Score one logit vector against many historical data variants
+        (e.g. a complexity sweep) in a single call
+
+        Softmax, the syntax/logic confidences and the base confidence depend
+        only on the logits, so they are computed once and shared across the batch.
+
+        Args:
+            logits: Raw model outputs (before softmax)
+            error_type: Type of error being addressed
+            historical_batch: One historical data dict (or None) per result
+
+        Returns:
+            List of ConfidenceScore, in the same order as historical_batch
+        """
+
+        probabilities = _softmax_cached(tuple(logits), self.temperature)
         max_prob = max(probabilities)
+        syntax_confidence = self._calculate_syntax_confidence(max_prob, error_type)
+        logic_confidence = self._calculate_logic_confidence(max_prob, error_type)
+
+        base_confidence = self._base_confidence(syntax_confidence, logic_confidence, error_type)
+
+        calibrate = len(self.historical_scores) >= 10
+        calibration_method = "beta_calibration" if calibrate else "temperature_scaling"
+
+        scores: List[ConfidenceScore] = []
+        for historical_data in historical_batch:
+            components = self._calculate_components(probabilities, error_type, historical_data)
+            overall_confidence = self._apply_components(base_confidence, components)
+            if calibrate:
+                overall_confidence = self._beta_calibrate(overall_confidence)
+            scores.append(ConfidenceScore(
+                overall_confidence=overall_confidence,
+                syntax_confidence=syntax_confidence,
+                logic_confidence=logic_confidence,
+                calibration_method=calibration_method,
+                components=components
+            ))
+        return scores
+
+    def calculate_confidence_rows(self,
+                                  logits_rows: List[List[float]],
+                                  error_types: List[ErrorType],
+                                  historical_data: Optional[Dict[str, Any]] = None,
+                                  historical_rows: Optional[List[Optional[Dict[str, Any]]]] = None) -> List[ConfidenceScore]:
+        """
+        Score many logit vectors (e.g. one per candidate patch) in a single call
 
-        # Calculate syntax vs logic confidence based on error type
-        syntax_confidence = self._calculate_syntax_confidence(probabilities, error_type)
-        logic_confidence = self._calculate_logic_confidence(probabilities, error_type)
+        Each row is scored by calculate_confidence_batch, so rows share the
+        memoized softmax and can't drift from the single-call pipeline.
 
-        # Calculate overall confidence with components
-        components = self._calculate_components(probabilities, error_type, historical_data)
-        overall_confidence = self._combine_confidences(
-            syntax_confidence, logic_confidence, components, error_type
-        )
+        Args:
+            logits_rows: One raw logit vector per patch
+            error_types: Error type for each row
+            historical_data: Optional historical performance data shared by all rows
+            historical_rows: Optional per-row historical data; overrides historical_data
+
+        Returns:
+            List of ConfidenceScore, one per row
+        """
 
-        # Apply beta calibration if we have historical data
-        if len(self.historical_scores) >= 10:
-            overall_confidence = self._beta_calibrate(overall_confidence)
+        if len(logits_rows) != len(error_types):
+            raise ValueError("logits_rows and error_types must have the same length")
+        if historical_rows is None:
+            historical_rows = [historical_data] * len(logits_rows)
+        elif len(historical_rows) != len(logits_rows):
+            raise ValueError("historical_rows and logits_rows must have the same length")
 
-        return ConfidenceScore(
-            overall_confidence=overall_confidence,
-            syntax_confidence=syntax_confidence,
-            logic_confidence=logic_confidence,
-            calibration_method="temperature_scaling" if len(self.historical_scores) < 10 else "beta_calibration",
-            components=components
-        )
+        return [
+            self.calculate_confidence_batch(logits, error_type, [historical])[0]
+            for logits, error_type, historical in zip(logits_rows, error_types, historical_rows)
+        ]
 
     def _softmax(self, logits: List[float]) -> List[float]:
         """Standard softmax function"""
-        if not logits:
-            return []
-        max_logit = max(logits)
-        exp_logits = [math.exp(logit - max_logit) for logit in logits]
-        sum_exp = sum(exp_logits)
-        if sum_exp == 0:
-            return [0.0 for _ in exp_logits]
-        return [exp_logit / sum_exp for exp_logit in exp_logits]
-
-    def _calculate_syntax_confidence(self, probabilities: List[float], error_type: ErrorType) -> float:
-        """Calculate confidence for syntax-related errors (stricter threshold)"""
-        max_prob = max(probabilities)
+        return list(_softmax_cached(tuple(logits)))
 
-        if error_type == ErrorType.SYNTAX:
+    def _calculate_syntax_confidence(self, max_prob: float, error_type: ErrorType) -> float:
+        """Calculate confidence for syntax-related errors (stricter threshold) from the top probability"""
+        if error_type is ErrorType.SYNTAX:
             # Syntax errors should be highly confident (>95% typically)
             return min(max_prob * 1.2, 1.0)  # Boost for syntax
         else:
             # For non-syntax errors, use standard probability
             return max_prob
 
-    def _calculate_logic_confidence(self, probabilities: List[float], error_type: ErrorType) -> float:
-        """Calculate confidence for logic-related errors (more forgiving)"""
-        max_prob = max(probabilities)
-
-        if error_type in [ErrorType.LOGIC, ErrorType.RUNTIME]:
+    def _calculate_logic_confidence(self, max_prob: float, error_type: ErrorType) -> float:
+        """Calculate confidence for logic-related errors (more forgiving) from the top probability"""
+        if error_type in _LOGIC_TYPES:
             # Logic errors can have lower confidence but still be acceptable
             return max_prob * 0.9  # Slight penalty for complexity
         else:
@@ -154,9 +226,7 @@ class UnifiedConfidenceScorer:
         # Code complexity penalty
         complexity_penalty = 1.0
         if historical_data and 'complexity_score' in historical_data:
-            complexity = historical_data['complexity_score']
-            # Higher complexity reduces confidence
-            complexity_penalty = max(0.1, 1.0 - (complexity - 1.0) * 0.1)
+            complexity_penalty = self._complexity_penalty(historical_data['complexity_score'])
 
         # Test coverage factor
         test_coverage = 0.5
@@ -170,27 +240,38 @@ class UnifiedConfidenceScorer:
             test_coverage=test_coverage
         )
 
+    @staticmethod
+    def _complexity_penalty(complexity: float) -> float:
+        """Higher complexity reduces confidence, floored at 0.1"""
+        penalty = 1.0 - (complexity - 1.0) * 0.1
+        return penalty if penalty > 0.1 else 0.1
+
     def _combine_confidences(self,
                            syntax_conf: float,
                            logic_conf: float,
                            components: ConfidenceComponents,
                            error_type: ErrorType) -> float:
         """Combine different confidence factors into overall score"""
-
-        # Base confidence depends on error type
-        if error_type == ErrorType.SYNTAX:
-            base_confidence = syntax_conf
-        elif error_type in [ErrorType.LOGIC, ErrorType.RUNTIME]:
-            base_confidence = logic_conf
-        else:
-            base_confidence = (syntax_conf + logic_conf) / 2
-
-        # Apply component modifiers
-        adjusted_confidence = base_confidence
-        adjusted_confidence *= components.historical_success_rate
-        adjusted_confidence *= components.pattern_similarity
-        adjusted_confidence *= components.code_complexity_penalty
-        adjusted_confidence *= (0.5 + components.test_coverage * 0.5)  # Test coverage boost
+        return self._apply_components(self._base_confidence(syntax_conf, logic_conf, error_type), components)
+
+    @staticmethod
+    def _base_confidence(syntax_conf: float, logic_conf: float, error_type: ErrorType) -> float:
+        """Base confidence depends on error type"""
+        if error_type is ErrorType.SYNTAX:
+            return syntax_conf
+        if error_type in _LOGIC_TYPES:
+            return logic_conf
+        return (syntax_conf + logic_conf) / 2
+
+    @staticmethod
+    def _apply_components(base_confidence: float, components: ConfidenceComponents) -> float:
+        """Apply component modifiers to a base confidence and clamp to [0, 1]"""
+        # One left-to-right product: same rounding as successive *= steps
+        adjusted_confidence = (base_confidence
+                               * components.historical_success_rate
+                               * components.pattern_similarity
+                               * components.code_complexity_penalty
+                               * (0.5 + components.test_coverage * 0.5))  # Test coverage boost
 
         # Ensure bounds
         return max(0.0, min(1.0, adjusted_confidence))
@@ -201,13 +282,7 @@ class UnifiedConfidenceScorer:
             return confidence
 
         # Simple beta calibration based on historical performance
-        correct_predictions = sum(1 for _, was_correct in self.historical_scores if was_correct)
-        total_predictions = len(self.historical_scores)
-
-        if total_predictions == 0:
-            return confidence
-
-        empirical_rate = correct_predictions / total_predictions
+        empirical_rate = self._correct_count / len(self.historical_scores)
 
         # Adjust confidence towards empirical rate
         calibrated = confidence * 0.7 + empirical_rate * 0.3
@@ -215,11 +290,15 @@ class UnifiedConfidenceScorer:
 
     def record_outcome(self, confidence: float, was_correct: bool):
         """Record the outcome of a confidence prediction for calibration"""
-        self.historical_scores.append((confidence, was_correct))
-
-        # Keep only recent samples for calibration
-        if len(self.historical_scores) > self.calibration_samples:
-            self.historical_scores.pop(0)
+        # Keep only recent samples for calibration: the deque evicts the
+        # oldest entry, so drop its contribution to the running count first
+        scores = self.historical_scores
+        if not scores.maxlen:
+            return
+        if len(scores) == scores.maxlen:
+            self._correct_count -= bool(scores[0][1])
+        scores.append((confidence, was_correct))
+        self._correct_count += bool(was_correct)
 
     def should_attempt_fix(self, confidence_score: ConfidenceScore, error_type: ErrorType) -> bool:
         """
@@ -228,15 +307,8 @@ class UnifiedConfidenceScorer:
         Returns True if confidence meets the threshold for the error type
         """
 
-        if error_type == ErrorType.SYNTAX:
-            # Syntax errors need very high confidence (>95%)
-            return confidence_score.syntax_confidence >= 0.95
-        elif error_type in [ErrorType.LOGIC, ErrorType.RUNTIME]:
-            # Logic errors can proceed with lower confidence (>80%)
-            return confidence_score.logic_confidence >= 0.80
-        else:
-            # Other errors use overall confidence (>85%)
-            return confidence_score.overall_confidence >= 0.85
+        accessor, threshold = _FIX_THRESHOLDS.get(error_type, _DEFAULT_FIX_THRESHOLD)
+        return accessor(confidence_score) >= threshold
 
 class DualCircuitBreaker:
     """
@@ -256,6 +328,11 @@ class DualCircuitBreaker:
 
         self.reset()
 
+    @staticmethod
+    def _over_budget(errors: int, attempts: int, budget: float) -> bool:
+        """Error rate above budget; budgets are read from the public attributes per check"""
+        return errors / max(1, attempts) > budget
+
     def reset(self):
         """Reset circuit breaker state"""
         self.syntax_attempts = 0
@@ -276,20 +353,20 @@ class DualCircuitBreaker:
         if self.circuit_state == CircuitState.PERMANENTLY_OPEN:
             return False, "Circuit breaker permanently open"
 
-        if error_type == ErrorType.SYNTAX:
+        if error_type is ErrorType.SYNTAX:
             if self.circuit_state == CircuitState.SYNTAX_OPEN:
                 return False, "Syntax circuit breaker open"
             if self.syntax_attempts >= self.syntax_max_attempts:
                 return False, f"Syntax attempts exceeded ({self.syntax_attempts}/{self.syntax_max_attempts})"
-            if self.syntax_errors / max(1, self.syntax_attempts) > self.syntax_error_budget:
+            if self._over_budget(self.syntax_errors, self.syntax_attempts, self.syntax_error_budget):
                 return False, f"Syntax error rate exceeded budget ({self.syntax_errors}/{self.syntax_attempts})"
 
-        elif error_type in [ErrorType.LOGIC, ErrorType.RUNTIME]:
+        elif error_type in _LOGIC_TYPES:
             if self.circuit_state == CircuitState.LOGIC_OPEN:
                 return False, "Logic circuit breaker open"
             if self.logic_attempts >= self.logic_max_attempts:
                 return False, f"Logic attempts exceeded ({self.logic_attempts}/{self.logic_max_attempts})"
-            if self.logic_errors / max(1, self.logic_attempts) > self.logic_error_budget:
+            if self._over_budget(self.logic_errors, self.logic_attempts, self.logic_error_budget):
                 return False, f"Logic error rate exceeded budget ({self.logic_errors}/{self.logic_attempts})"
 
         return True, "OK"
@@ -300,24 +377,24 @@ class DualCircuitBreaker:
         self.total_attempts += 1
         self.last_attempt_time = datetime.now(timezone.utc).isoformat()
 
-        if error_type == ErrorType.SYNTAX:
+        if error_type is ErrorType.SYNTAX:
             self.syntax_attempts += 1
             if not success:
                 self.syntax_errors += 1
 
                 # Check if we should open syntax circuit
-                error_rate = self.syntax_errors / self.syntax_attempts
-                if error_rate > self.syntax_error_budget or self.syntax_attempts >= self.syntax_max_attempts:
+                if (self._over_budget(self.syntax_errors, self.syntax_attempts, self.syntax_error_budget)
+                        or self.syntax_attempts >= self.syntax_max_attempts):
                     self.circuit_state = CircuitState.SYNTAX_OPEN
 
-        elif error_type in [ErrorType.LOGIC, ErrorType.RUNTIME]:
+        elif error_type in _LOGIC_TYPES:
             self.logic_attempts += 1
             if not success:
                 self.logic_errors += 1
 
                 # Check if we should open logic circuit
-                error_rate = self.logic_errors / self.logic_attempts
-                if error_rate > self.logic_error_budget or self.logic_attempts >= self.logic_max_attempts:
+                if (self._over_budget(self.logic_errors, self.logic_attempts, self.logic_error_budget)
+                        or self.logic_attempts >= self.logic_max_attempts):
                     self.circuit_state = CircuitState.LOGIC_OPEN
 
         # If both circuits are open, permanently open
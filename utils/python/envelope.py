@@ -1,21 +1,62 @@
 import json
-import copy
+import functools
+import itertools
 import hashlib
+import re
+import time
+import weakref
 from abc import ABC, abstractmethod
+from collections import Counter, defaultdict, deque
 from contextlib import contextmanager
-from typing import Dict, Any, List, Optional, Iterator
-from datetime import datetime
+from typing import Dict, Any, List, Optional, Iterator, Tuple, Union
 from .envelope_helpers import (
+    MAX_HISTORY_ENTRIES,
+    _naive_deepcopy as _safe_copy,
+    _update_stable_canonical,
     append_attempt,
+    json_dumps_stable_bytes,
     mark_success as helper_mark_success,
     set_envelope_timestamp,
-    set_envelope_hash,
 )
 
+
+@functools.lru_cache(maxsize=1)
+def _iso_second(seconds: int) -> str:
+    return time.strftime("%Y-%m-%dT%H:%M:%S", time.localtime(seconds))
+
+
+def _iso_from_ns(ns: int) -> str:
+    """Local ISO-8601 timestamp, formatted like ``datetime.isoformat()``"""
+    seconds, remainder = divmod(ns, 1_000_000_000)
+    micros = remainder // 1_000
+    # Envelopes are stamped many times per second: the date/time part is
+    # formatted once per second and only the microseconds per call
+    if micros:
+        return f"{_iso_second(seconds)}.{micros:06d}"
+    return _iso_second(seconds)
+
+
+def _now_iso() -> str:
+    return _iso_from_ns(time.time_ns())
+
+
+def _invalidates_json(method):
+    """Mark a PatchEnvelope method as mutating: drop the cached JSON body first."""
+
+    @functools.wraps(method)
+    def wrapper(self, *args, **kwargs):
+        self._json_cache = None
+        return method(self, *args, **kwargs)
+
+    return wrapper
+
 class PatchEnvelope:
     """Encapsulated representation of the patch envelope payload."""
 
-    __slots__ = ("_data",)
+    __slots__ = ("_data", "_patch_data_json", "_json_cache", "__weakref__")
+
+    # attempts/timeline keep only the most recent entries so long sessions stay bounded
+    MAX_HISTORY_ENTRIES = MAX_HISTORY_ENTRIES
 
     def __init__(
         self,
@@ -39,30 +80,34 @@ class PatchEnvelope:
     ) -> None:
         self._data: Dict[str, Any] = {
             "patch_id": patch_id,
-            "patch_data": copy.deepcopy(patch_data),
-            "metadata": copy.deepcopy(metadata) if metadata is not None else {},
-            "attempts": copy.deepcopy(attempts) if attempts is not None else [],
-            "confidenceComponents": copy.deepcopy(confidenceComponents)
+            "patch_data": _safe_copy(patch_data),
+            "metadata": _safe_copy(metadata) if metadata is not None else {},
+            "attempts": _safe_copy(attempts) if attempts is not None else [],
+            "confidenceComponents": _safe_copy(confidenceComponents)
             if confidenceComponents is not None
             else {},
             "breakerState": breakerState,
             "cascadeDepth": cascadeDepth,
-            "resourceUsage": copy.deepcopy(resourceUsage) if resourceUsage is not None else {},
+            "resourceUsage": _safe_copy(resourceUsage) if resourceUsage is not None else {},
             "flagged_for_developer": bool(flagged_for_developer),
             "developer_message": developer_message,
             "developer_flag_reason": developer_flag_reason,
             "success": bool(success),
-            "trendMetadata": copy.deepcopy(trend_metadata)
+            "trendMetadata": _safe_copy(trend_metadata)
             if trend_metadata is not None
             else {
                 "errorsDetected": 0,
                 "errorsResolved": 0,
                 "errorTrend": "unknown",
             },
-            "counters": copy.deepcopy(counters) if counters is not None else {},
-            "timeline": copy.deepcopy(timeline) if timeline is not None else [],
+            "counters": _safe_copy(counters) if counters is not None else {},
+            "timeline": _safe_copy(timeline) if timeline is not None else [],
             "envelopeHash": envelope_hash,
         }
+        self._patch_data_json: Optional[bytes] = None
+        # indent -> serialized payload without the timestamp (see to_json)
+        self._json_cache: Optional[Dict[Optional[int], str]] = None
+        self._trim_history()
 
     # ------------------------------------------------------------------
     # Properties (read-only views)
@@ -73,19 +118,17 @@ class PatchEnvelope:
 
     @property
     def patch_data(self) -> Dict[str, Any]:
-        return copy.deepcopy(self._data["patch_data"])
+        return _safe_copy(self._data["patch_data"])
 
     @property
     def attempts(self) -> List[Dict[str, Any]]:
-        return copy.deepcopy(self._data["attempts"])
+        return _safe_copy(self._data["attempts"])
 
     @property
     def breaker_state(self) -> str:
         return self._data["breakerState"]
 
-    @property
-    def breakerState(self) -> str:  # Backwards compatibility alias
-        return self.breaker_state
+    breakerState = property(breaker_state.fget)  # Backwards compatibility alias, same getter
 
     @breakerState.setter
     def breakerState(self, value: str) -> None:
@@ -95,9 +138,7 @@ class PatchEnvelope:
     def cascade_depth(self) -> int:
         return self._data["cascadeDepth"]
 
-    @property
-    def cascadeDepth(self) -> int:  # Backwards compatibility alias
-        return self.cascade_depth
+    cascadeDepth = property(cascade_depth.fget)  # Backwards compatibility alias, same getter
 
     @cascadeDepth.setter
     def cascadeDepth(self, value: int) -> None:
@@ -107,9 +148,7 @@ class PatchEnvelope:
     def is_successful(self) -> bool:
         return bool(self._data["success"])
 
-    @property
-    def success(self) -> bool:  # Backwards compatibility alias
-        return self.is_successful
+    success = property(is_successful.fget)  # Backwards compatibility alias, same getter
 
     @success.setter
     def success(self, value: bool) -> None:
@@ -119,9 +158,7 @@ class PatchEnvelope:
     def is_flagged(self) -> bool:
         return bool(self._data["flagged_for_developer"])
 
-    @property
-    def flagged_for_developer(self) -> bool:  # Backwards compatibility alias
-        return self.is_flagged
+    flagged_for_developer = property(is_flagged.fget)  # Backwards compatibility alias, same getter
 
     @flagged_for_developer.setter
     def flagged_for_developer(self, value: bool) -> None:
@@ -148,43 +185,40 @@ class PatchEnvelope:
 
     @property
     def metadata(self) -> Dict[str, Any]:
-        return copy.deepcopy(self._data["metadata"])
+        return _safe_copy(self._data["metadata"])
 
     @metadata.setter
+    @_invalidates_json
     def metadata(self, value: Dict[str, Any]) -> None:
-        self._data["metadata"] = copy.deepcopy(value or {})
+        self._data["metadata"] = _safe_copy(value or {})
 
     @property
     def resource_usage(self) -> Dict[str, Any]:
-        return copy.deepcopy(self._data["resourceUsage"])
+        return _safe_copy(self._data["resourceUsage"])
 
-    @property
-    def resourceUsage(self) -> Dict[str, Any]:  # Backwards compatibility alias
-        return self.resource_usage
+    resourceUsage = property(resource_usage.fget)  # Backwards compatibility alias, same getter
 
     @resourceUsage.setter
+    @_invalidates_json
     def resourceUsage(self, value: Dict[str, Any]) -> None:
-        self._data["resourceUsage"] = copy.deepcopy(value or {})
+        self._data["resourceUsage"] = _safe_copy(value or {})
 
     @property
     def trend_metadata(self) -> Dict[str, Any]:
-        return copy.deepcopy(self._data["trendMetadata"])
+        return _safe_copy(self._data["trendMetadata"])
 
-    @property
-    def trendMetadata(self) -> Dict[str, Any]:  # Backwards compatibility alias
-        return self.trend_metadata
+    trendMetadata = property(trend_metadata.fget)  # Backwards compatibility alias, same getter
 
     @trendMetadata.setter
+    @_invalidates_json
     def trendMetadata(self, value: Dict[str, Any]) -> None:
-        self._data["trendMetadata"] = copy.deepcopy(value or {})
+        self._data["trendMetadata"] = _safe_copy(value or {})
 
     @property
     def confidence_components(self) -> Dict[str, float]:
-        return copy.deepcopy(self._data["confidenceComponents"])
+        return _safe_copy(self._data["confidenceComponents"])
 
-    @property
-    def confidenceComponents(self) -> Dict[str, float]:  # Backwards compatibility alias
-        return self.confidence_components
+    confidenceComponents = property(confidence_components.fget)  # Backwards compatibility alias, same getter
 
     @confidenceComponents.setter
     def confidenceComponents(self, value: Dict[str, float]) -> None:
@@ -192,7 +226,7 @@ class PatchEnvelope:
 
     @property
     def counters(self) -> Dict[str, int]:
-        return copy.deepcopy(self._data["counters"])
+        return _safe_copy(self._data["counters"])
 
     @counters.setter
     def counters(self, value: Dict[str, int]) -> None:
@@ -200,7 +234,7 @@ class PatchEnvelope:
 
     @property
     def timeline(self) -> List[Dict[str, Any]]:
-        return copy.deepcopy(self._data["timeline"])
+        return _safe_copy(self._data["timeline"])
 
     @timeline.setter
     def timeline(self, value: List[Dict[str, Any]]) -> None:
@@ -210,9 +244,7 @@ class PatchEnvelope:
     def envelope_hash(self) -> Optional[str]:
         return self._data["envelopeHash"]
 
-    @property
-    def envelopeHash(self) -> Optional[str]:  # Backwards compatibility alias
-        return self.envelope_hash
+    envelopeHash = property(envelope_hash.fget)  # Backwards compatibility alias, same getter
 
     @envelopeHash.setter
     def envelopeHash(self, value: Optional[str]) -> None:
@@ -221,20 +253,25 @@ class PatchEnvelope:
     # ------------------------------------------------------------------
     # Controlled mutation helpers
     # ------------------------------------------------------------------
+    @_invalidates_json
     def merge_metadata(self, extra: Optional[Dict[str, Any]]) -> None:
         if not extra:
             return
-        self._data["metadata"].update(copy.deepcopy(extra))
+        self._data["metadata"].update(_safe_copy(extra))
 
+    @_invalidates_json
     def set_breaker_state(self, state: str) -> None:
         self._data["breakerState"] = state
 
+    @_invalidates_json
     def set_cascade_depth(self, depth: int) -> None:
         self._data["cascadeDepth"] = max(0, int(depth))
 
+    @_invalidates_json
     def mark_success(self, success: bool = True) -> None:
         self._data["success"] = bool(success)
 
+    @_invalidates_json
     def flag_for_developer(
         self,
         *,
@@ -247,71 +284,151 @@ class PatchEnvelope:
         if reason is not None:
             self._data["developer_flag_reason"] = reason
 
+    @_invalidates_json
     def clear_developer_flag(self) -> None:
         self._data["flagged_for_developer"] = False
         self._data["developer_message"] = ""
         self._data["developer_flag_reason"] = None
 
+    @_invalidates_json
     def set_developer_message(self, message: str) -> None:
         self._data["developer_message"] = message
 
+    @_invalidates_json
     def set_developer_reason(self, reason: Optional[str]) -> None:
         self._data["developer_flag_reason"] = reason
 
+    @_invalidates_json
     def add_attempt(self, attempt: Dict[str, Any]) -> None:
-        self._data["attempts"].append(copy.deepcopy(attempt))
+        self._data["attempts"].append(_safe_copy(attempt))
+        self._trim_history()
 
+    @_invalidates_json
     def update_confidence(self, components: Dict[str, float]) -> None:
-        self._data["confidenceComponents"] = copy.deepcopy(components)
+        self._data["confidenceComponents"] = _safe_copy(components)
 
+    @_invalidates_json
     def update_resource_usage(self, usage: Dict[str, Any]) -> None:
-        self._data["resourceUsage"].update(copy.deepcopy(usage))
+        self._data["resourceUsage"].update(_safe_copy(usage))
 
+    @_invalidates_json
     def update_trend(self, trend: Dict[str, Any]) -> None:
-        self._data["trendMetadata"].update(copy.deepcopy(trend))
+        self._data["trendMetadata"].update(_safe_copy(trend))
 
+    @_invalidates_json
     def update_counters(self, counters: Dict[str, int]) -> None:
-        self._data["counters"].update(copy.deepcopy(counters))
+        self._data["counters"].update(_safe_copy(counters))
 
+    @_invalidates_json
     def update_timeline(self, timeline: List[Dict[str, Any]]) -> None:
-        self._data["timeline"] = copy.deepcopy(timeline)
+        self._data["timeline"] = _safe_copy(timeline)
+        self._trim_history()
+
+    def _trim_history(self) -> None:
+        limit = self.MAX_HISTORY_ENTRIES
+        for key in ("attempts", "timeline"):
+            history = self._data.get(key)
+            if isinstance(history, list) and len(history) > limit:
+                del history[:-limit]
 
+    @_invalidates_json
     def set_envelope_hash(self, envelope_hash: Optional[str]) -> None:
         self._data["envelopeHash"] = envelope_hash
 
+    def stable_hash(self) -> str:
+        """Same digest as compute_stable_envelope_hash(self.to_dict()), streamed key by key.
+
+        patch_data cannot change once wrapped, so its canonical encoding (usually
+        the bulk of the payload) is computed once and reused on every rehash.
+        """
+        if self._patch_data_json is None:
+            self._patch_data_json = json_dumps_stable_bytes(self._data["patch_data"])
+        hasher = hashlib.sha256()
+        _update_stable_canonical(hasher.update, self._data, {"patch_data": self._patch_data_json})
+        return hasher.hexdigest()
+
     # ------------------------------------------------------------------
     # Dict / JSON views
     # ------------------------------------------------------------------
-    def to_dict(self, *, include_timestamp: bool = False) -> Dict[str, Any]:
-        snapshot = copy.deepcopy(self._data)
+    def to_dict(self, *, include_timestamp: bool = False, timestamp: Optional[str] = None) -> Dict[str, Any]:
+        # Per-key copies: scalar fields skip deepcopy's memo/dispatch machinery
+        snapshot = {key: _safe_copy(value) for key, value in self._data.items()}
         if include_timestamp:
-            snapshot["timestamp"] = datetime.now().isoformat()
+            snapshot["timestamp"] = timestamp or _now_iso()
         return snapshot
 
-    def to_json(self) -> str:
-        return json.dumps(self.to_dict(include_timestamp=True), indent=2)
+    def to_json(self, *, timestamp: Optional[str] = None, indent: Optional[int] = 2) -> str:
+        """Serialize with a timestamp; indent=None gives compact output for internal use"""
+        timestamp = timestamp or _now_iso()
+        data = self._data
+        if "timestamp" in data and next(reversed(data)) != "timestamp":
+            # Timestamp sits mid-payload: it cannot be spliced onto a cached body
+            snapshot = dict(data)
+            snapshot["timestamp"] = timestamp
+            return self._dumps(snapshot, indent)
+
+        # The payload only changes through methods that reset _json_cache, so the
+        # body is serialized once per mutation and the timestamp (always the last
+        # key) is appended per call
+        cache = self._json_cache
+        if cache is None:
+            cache = self._json_cache = {}
+        body = cache.get(indent)
+        if body is None:
+            body = cache[indent] = self._dumps(
+                {key: value for key, value in data.items() if key != "timestamp"}, indent
+            )
+        if indent is None:
+            return f'{body[:-1]},"timestamp":{json.dumps(timestamp)}}}'
+        return f'{body[:-2]},\n{" " * indent}"timestamp": {json.dumps(timestamp)}\n}}'
+
+    @staticmethod
+    def _dumps(payload: Dict[str, Any], indent: Optional[int]) -> str:
+        if indent is None:
+            return json.dumps(payload, separators=(",", ":"))
+        return json.dumps(payload, indent=indent)
 
     @classmethod
     def from_json(cls, json_str: str) -> 'PatchEnvelope':
-        data = json.loads(json_str)
-        return cls(
-            patch_id=data["patch_id"],
-            patch_data=data["patch_data"],
-            metadata=data.get("metadata", {}),
-            attempts=data.get("attempts", []),
-            confidenceComponents=data.get("confidenceComponents", {}),
-            breakerState=data.get("breakerState", "CLOSED"),
-            cascadeDepth=data.get("cascadeDepth", 0),
-            resourceUsage=data.get("resourceUsage", {}),
-            flagged_for_developer=data.get("flagged_for_developer", False),
-            developer_message=data.get("developer_message", ""),
-            developer_flag_reason=data.get("developer_flag_reason"),
-            success=data.get("success", False),
-            trend_metadata=data.get("trendMetadata"),
-            counters=data.get("counters"),
-            timeline=data.get("timeline"),
-            envelope_hash=data.get("envelopeHash"),
-        )
+        return cls._adopt(json.loads(json_str))
+
+    @classmethod
+    def _adopt(cls, data: Dict[str, Any]) -> 'PatchEnvelope':
+        """Build an envelope that takes ownership of ``data``'s structures.
+
+        Unlike __init__, nothing is deep-copied: only pass payloads nobody else
+        references (freshly decoded JSON, or structures built by the caller for
+        this envelope alone). Missing fields get the same defaults as __init__.
+        """
+        envelope = cls.__new__(cls)
+        envelope._data = {
+            "patch_id": data["patch_id"],
+            "patch_data": data["patch_data"],
+            "metadata": data.get("metadata") or {},
+            "attempts": data.get("attempts") or [],
+            "confidenceComponents": data.get("confidenceComponents") or {},
+            "breakerState": data.get("breakerState", "CLOSED"),
+            "cascadeDepth": data.get("cascadeDepth", 0),
+            "resourceUsage": data.get("resourceUsage") or {},
+            "flagged_for_developer": bool(data.get("flagged_for_developer", False)),
+            "developer_message": data.get("developer_message", ""),
+            "developer_flag_reason": data.get("developer_flag_reason"),
+            "success": bool(data.get("success", False)),
+            "trendMetadata": data["trendMetadata"]
+            if data.get("trendMetadata") is not None
+            else {
+                "errorsDetected": 0,
+                "errorsResolved": 0,
+                "errorTrend": "unknown",
+            },
+            "counters": data.get("counters") or {},
+            "timeline": data.get("timeline") or [],
+            "envelopeHash": data.get("envelopeHash"),
+        }
+        envelope._patch_data_json = None
+        envelope._json_cache = None
+        envelope._trim_history()
+        return envelope
 
     # ------------------------------------------------------------------
     # Controlled dictionary mutation for helper compatibility
@@ -326,26 +443,56 @@ class PatchEnvelope:
         finally:
             self._absorb(snapshot)
 
+    @_invalidates_json
     def _absorb(self, mutated: Dict[str, Any]) -> None:
         base_id = self._data["patch_id"]
+        missing = object()
         for key, value in mutated.items():
             if key == "patch_id" and value != base_id:
                 raise ValueError("patch_id is immutable once set")
             if key == "patch_data" and value != self._data["patch_data"]:
                 raise ValueError("patch_data mutation is not supported via mutable_payload")
-            self._data[key] = copy.deepcopy(value)
+            current = self._data.get(key, missing)
+            if current is not missing and type(current) is type(value) and current == value:
+                continue  # unchanged: keep the existing copy instead of deep-copying it again
+            self._data[key] = _safe_copy(value)
+        self._trim_history()
 
     # Convenience access used by helper utilities that expect dict-like input
     def apply_helper(self, helper_callable, *args, **kwargs) -> None:
-        with self.mutable_payload() as payload:
-            helper_callable(payload, *args, **kwargs)
+        self.apply_multiple_helpers((helper_callable, args, kwargs))
 
+    @_invalidates_json
     def apply_multiple_helpers(self, *operations) -> None:
-        with self.mutable_payload() as payload:
+        """Run envelope_helpers-style mutators directly on the payload.
+
+        Helper arguments are copied so the payload never aliases caller data,
+        but the payload itself is not snapshotted and re-absorbed (use
+        mutable_payload for a detached copy). patch_id and patch_data stay
+        immutable: a helper that replaces or edits either is undone and rejected.
+        """
+        payload = self._data
+        # patch_data is snapshotted because helpers receive the live payload and
+        # could edit it in place (which would also stale _patch_data_json)
+        patch_id, patch_data = payload["patch_id"], _safe_copy(payload["patch_data"])
+        try:
             for fn, args, kwargs in operations:
-                fn(payload, *args, **kwargs)
+                fn(payload, *_safe_copy(args), **_safe_copy(kwargs))
+        finally:
+            replaced_id = payload.get("patch_id") != patch_id
+            replaced_data = payload.get("patch_data") != patch_data
+            payload["patch_id"] = patch_id
+            if replaced_data:
+                payload["patch_data"] = patch_data
+            self._trim_history()
+        if replaced_id:
+            raise ValueError("patch_id is immutable once set")
+        if replaced_data:
+            raise ValueError("patch_data mutation is not supported via helpers")
 
 class PatchWrapper(ABC):
+    __slots__ = ()
+
     @abstractmethod
     def wrap_patch(self, patch: Dict[str, Any]) -> PatchEnvelope:
         pass
@@ -355,24 +502,35 @@ class PatchWrapper(ABC):
         pass
 
 class AIPatchEnvelope(PatchWrapper):
+    __slots__ = ("envelopes", "_id_counter")
+
     def __init__(self):
-        self.envelopes = {}
+        # Weak values: an envelope is tracked only while a caller still holds it,
+        # so long-running wrappers do not keep every patch alive forever
+        self.envelopes = weakref.WeakValueDictionary()
+        self._id_counter = itertools.count(1)  # disambiguates same-second re-wraps
     
     def wrap_patch(self, patch: Dict[str, Any]) -> PatchEnvelope:
         canonical = json.dumps(patch, sort_keys=True, separators=(",", ":")).encode("utf-8")
-        digest = hashlib.sha256(canonical).hexdigest()[:12]
-        patch_id = f"patch_{int(datetime.now().timestamp())}_{digest}"
+        # 6-byte blake2b digest: same 12-hex-char suffix, cheaper than truncated SHA-256
+        digest = hashlib.blake2b(canonical, digest_size=6).hexdigest()
+        now_ns = time.time_ns()
+        patch_id = f"patch_{now_ns // 1_000_000_000}_{digest}"
+        if patch_id in self.envelopes:
+            # Same patch wrapped again within the same second: keep both envelopes
+            patch_id = f"{patch_id}_{next(self._id_counter)}"
         
-        envelope = PatchEnvelope(
-            patch_id=patch_id,
-            patch_data=patch,
-            metadata={
-                "created_at": datetime.now().isoformat(),
+        # Only the caller's patch needs a defensive copy; the rest is built here
+        envelope = PatchEnvelope._adopt({
+            "patch_id": patch_id,
+            "patch_data": _safe_copy(patch),
+            "metadata": {
+                "created_at": _iso_from_ns(now_ns),
                 "language": "python",
                 "ai_generated": True
             },
-            attempts=[]
-        )
+            "attempts": []
+        })
         
         self.envelopes[patch_id] = envelope
         return envelope
@@ -382,11 +540,10 @@ class AIPatchEnvelope(PatchWrapper):
         # For now, it's a placeholder that simulates execution
         
         # Check if this is a "big error" that should be flagged
-        patch_snapshot = envelope.patch_data
-        if self._is_big_error(patch_snapshot):
-            envelope.flag_for_developer(
-                message=self._generate_developer_message(patch_snapshot)
-            )
+        # Read-only use: classify straight from the payload, no defensive copy
+        is_big_error, developer_message = self._classify_patch(envelope._data["patch_data"])
+        if is_big_error:
+            envelope.flag_for_developer(message=developer_message)
             return {
                 "success": False,
                 "flagged": True,
@@ -394,8 +551,9 @@ class AIPatchEnvelope(PatchWrapper):
                 "envelope": envelope.to_json()
             }
         
-        # Simulate successful execution
+        # Simulate successful execution; one clock read stamps both the payload and its JSON
         execution_details = "Patch executed successfully"
+        timestamp = _now_iso()
         envelope.apply_multiple_helpers(
             (helper_mark_success, (True,), {}),
             (
@@ -408,70 +566,165 @@ class AIPatchEnvelope(PatchWrapper):
                     "failure_count": 0,
                 },
             ),
-            (set_envelope_timestamp, (), {}),
-            (set_envelope_hash, (), {}),
+            (set_envelope_timestamp, (timestamp,), {}),
         )
+        envelope.set_envelope_hash(envelope.stable_hash())
         result = {
             "success": True,
             "patch_id": envelope.patch_id,
             "execution_details": execution_details,
-            "envelope": envelope.to_json()
+            "envelope": envelope.to_json(timestamp=timestamp)
         }
         return result
     
+    # Big-error markers in message priority order; None falls back to the generic message
+    _BIG_ERROR_MARKERS = (
+        ("database_schema_change",
+         "Database schema modification detected. Please review for data integrity and migration implications."),
+        ("authentication_bypass",
+         "Authentication-related changes detected. Critical security review required."),
+        ("production_data_modification",
+         "Production data modification detected. Please verify backup and rollback procedures."),
+        ("critical_security_vulnerability", None),
+    )
+    _COMPLEX_PATCH_MESSAGE = "Complex patch detected requiring manual review before deployment."
+    # One alternation scan rejects marker-free patches (the common case) in a single pass
+    _BIG_ERROR_RE = re.compile("|".join(re.escape(marker) for marker, _ in _BIG_ERROR_MARKERS))
+
+    def _classify_patch(self, patch_data: Dict[str, Any]) -> Tuple[bool, str]:
+        """Return (is_big_error, developer_message) from a single str() of the patch"""
+        text = str(patch_data)
+        if self._BIG_ERROR_RE.search(text):
+            # Rare path: resolve which marker wins by priority, not by position
+            for marker, message in self._BIG_ERROR_MARKERS:
+                if marker in text:
+                    return True, message or self._COMPLEX_PATCH_MESSAGE
+        return len(text) > 1000, self._COMPLEX_PATCH_MESSAGE  # Large/complex patches
+
     def _is_big_error(self, patch_data: Dict[str, Any]) -> bool:
         """Determine if this is a 'big error' that needs developer attention"""
-        error_indicators = [
-            "database_schema_change" in str(patch_data),
-            "authentication_bypass" in str(patch_data),
-            "critical_security_vulnerability" in str(patch_data),
-            "production_data_modification" in str(patch_data),
-            len(str(patch_data)) > 1000  # Large/complex patches
-        ]
-        return any(error_indicators)
+        return self._classify_patch(patch_data)[0]
     
     def _generate_developer_message(self, patch_data: Dict[str, Any]) -> str:
         """Generate a message for the developer about why this needs review"""
-        if "database_schema_change" in str(patch_data):
-            return "Database schema modification detected. Please review for data integrity and migration implications."
-        elif "authentication_bypass" in str(patch_data):
-            return "Authentication-related changes detected. Critical security review required."
-        elif "production_data_modification" in str(patch_data):
-            return "Production data modification detected. Please verify backup and rollback procedures."
-        else:
-            return "Complex patch detected requiring manual review before deployment."
+        return self._classify_patch(patch_data)[1]
+
+
+_WORD_RE = re.compile(r"[a-z0-9]+")
+
 
 class MemoryBuffer:
     """Simulates AI memory buffer for learning from patch outcomes"""
+
+    __slots__ = ("buffer", "max_size", "_postings", "_by_seq", "_tokens_by_seq", "_next_seq")
+
+    # Patches are similar when they share more than two tokens
+    _MIN_SHARED_TOKENS = 3
+
     def __init__(self, max_size: int = 100):
-        self.buffer = []
+        self.buffer: deque = deque(maxlen=max_size)  # appends evict the oldest entry in O(1)
         self.max_size = max_size
+        # Inverted index: token -> sequence numbers of buffered items containing it
+        self._postings: Dict[str, set] = defaultdict(set)
+        self._by_seq: Dict[int, Dict[str, Any]] = {}
+        # Tokens live beside the records, so records stay JSON-serializable
+        self._tokens_by_seq: Dict[int, frozenset] = {}
+        self._next_seq = 0
     
-    def add_outcome(self, envelope_json: str):
-        """Add patch outcome to memory buffer"""
-        self.buffer.append({
+    def add_outcome(self, envelope: Union[str, Dict[str, Any], PatchEnvelope]):
+        """Add patch outcome to memory buffer
+
+        Accepts the envelope as JSON, a plain dict or a PatchEnvelope. The
+        decoded form is kept under "_envelope_obj" so queries never re-parse
+        it; "envelope" always holds the JSON text for consumers that want it.
+        """
+        now_iso = _now_iso()
+        if isinstance(envelope, str):
+            envelope_json = envelope
+            envelope_obj = json.loads(envelope)
+        elif isinstance(envelope, PatchEnvelope):
+            # One compact dump plus a parse yields an independent snapshot more
+            # cheaply than deepcopy followed by a dump
+            envelope_json = envelope.to_json(timestamp=now_iso, indent=None)
+            envelope_obj = json.loads(envelope_json)
+        else:
+            # Snapshot the caller's dict so later mutations cannot make the
+            # stored JSON, object and tokens disagree
+            envelope_obj = _safe_copy(envelope)
+            envelope_json = json.dumps(envelope_obj, separators=(",", ":"))
+        item = {
             "envelope": envelope_json,
-            "timestamp": datetime.now().isoformat()
-        })
+            "_envelope_obj": envelope_obj,
+            "timestamp": now_iso
+        }
+        tokens = self._tokenize(envelope_obj["patch_data"])  # tokenized once, reused by every query
+
+        seq = self._next_seq
+        self._next_seq += 1
+        self._by_seq[seq] = item
+        self._tokens_by_seq[seq] = tokens
+        if len(tokens) >= self._MIN_SHARED_TOKENS:  # smaller sets can never match
+            for token in tokens:
+                self._postings[token].add(seq)
         
-        # Maintain buffer size
-        if len(self.buffer) > self.max_size:
-            self.buffer.pop(0)
+        # Maintain buffer size: a full deque drops its oldest entry on append,
+        # which has the lowest live sequence number, so unindex it first
+        if len(self.buffer) == self.buffer.maxlen:
+            self._evict(seq - self.buffer.maxlen)
+        self.buffer.append(item)
+
+    def _evict(self, seq: int) -> None:
+        del self._by_seq[seq]
+        tokens = self._tokens_by_seq.pop(seq)
+        if len(tokens) < self._MIN_SHARED_TOKENS:
+            return  # never indexed
+        for token in tokens:
+            postings = self._postings[token]
+            postings.discard(seq)
+            if not postings:
+                del self._postings[token]
     
     def get_similar_outcomes(self, patch_data: Dict[str, Any]) -> List[Dict[str, Any]]:
         """Retrieve similar past outcomes for learning"""
-        similar = []
-        for item in self.buffer:
-            envelope = PatchEnvelope.from_json(item["envelope"])
-            if self._is_similar(envelope.patch_data, patch_data):
-                similar.append(item)
-        return similar[-5:]  # Return last 5 similar outcomes
+        query_tokens = self._tokenize(patch_data)
+        if len(query_tokens) < self._MIN_SHARED_TOKENS:
+            return []
+        # Count shared tokens only for items that share at least one token
+        shared: Counter = Counter()
+        postings = self._postings
+        for token in query_tokens:
+            if token in postings:
+                shared.update(postings[token])
+        similar = sorted(seq for seq, count in shared.items() if count >= self._MIN_SHARED_TOKENS)
+        return [self._by_seq[seq] for seq in similar[-5:]]  # Return last 5 similar outcomes
+
+    @staticmethod
+    def _tokenize(patch: Dict[str, Any]) -> frozenset:
+        """Alphanumeric words of the patch's keys and leaf values (as in the TS port)
+
+        Walks the structure instead of splitting ``str(patch)``, so tokens carry
+        no quote/brace fragments and no repr of the whole patch is built.
+        """
+        tokens: set = set()
+        find_words = _WORD_RE.findall
+        stack: List[Any] = [patch]
+        while stack:
+            node = stack.pop()
+            if isinstance(node, dict):
+                for key, value in node.items():
+                    tokens.update(find_words(str(key).lower()))
+                    stack.append(value)
+            elif isinstance(node, (list, tuple)):
+                stack.extend(node)
+            elif isinstance(node, str):
+                tokens.update(find_words(node.lower()))
+            else:  # numbers, booleans, null: tokenized in their JSON spelling
+                tokens.update(find_words(json.dumps(node, default=str).lower()))
+        return frozenset(tokens)
     
-    def _is_similar(self, past_patch: Dict[str, Any], current_patch: Dict[str, Any]) -> bool:
-        """Simple similarity check - can be enhanced with ML"""
-        past_keys = set(str(past_patch).lower().split())
-        current_keys = set(str(current_patch).lower().split())
-        return len(past_keys.intersection(current_keys)) > 2
+    def _is_similar(self, past_tokens: frozenset, current_tokens: frozenset) -> bool:
+        """Simple similarity check on pre-tokenized patches - can be enhanced with ML"""
+        return len(past_tokens & current_tokens) >= self._MIN_SHARED_TOKENS
 
 # Usage example
 if __name__ == "__main__":
@@ -5,10 +5,12 @@ breaking existing logic.
 """
 from __future__ import annotations
 from typing import Any, Dict, List, Optional, Callable, TypedDict, Literal
-from dataclasses import asdict
-from datetime import datetime
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import fields, is_dataclass
 import copy
+import functools
 import hashlib
+import time
 
 BreakerState = Literal["OPEN", "CLOSED", "HALF_OPEN"]
 
@@ -25,15 +27,30 @@ ResourceUsageSnapshot = Dict[str, Any]
 
 ISO8601 = str
 
+@functools.lru_cache(maxsize=1)
+def _utc_second(seconds: int) -> str:
+    return time.strftime("%Y-%m-%dT%H:%M:%S", time.gmtime(seconds))
+
 def _now_iso() -> ISO8601:
-    return datetime.utcnow().isoformat() + "Z"
+    # Same text as datetime.utcnow().isoformat() + "Z", without building a
+    # datetime; the date/time part is formatted once per second
+    seconds, remainder = divmod(time.time_ns(), 1_000_000_000)
+    micros = remainder // 1_000
+    if micros:
+        return f"{_utc_second(seconds)}.{micros:06d}Z"
+    return _utc_second(seconds) + "Z"
 
 def _now_epoch_sec() -> int:
-    return int(datetime.utcnow().timestamp())
+    return time.time_ns() // 1_000_000_000
 
 def _clamp01(x: Optional[float]) -> Optional[float]:
     if x is None:
         return None
+    if type(x) is float:
+        # Hot path: plain floats skip the try block and the min/max calls
+        if x != x:  # NaN
+            return None
+        return 0.0 if x <= 0.0 else 1.0 if x > 1.0 else x  # <= folds -0.0 into 0.0
     try:
         if x != x:  # NaN
             return None
@@ -43,14 +60,25 @@ def _clamp01(x: Optional[float]) -> Optional[float]:
 
 # Accept either dataclass PatchEnvelope or dict-like.
 
+# attempts/timeline are excluded from the hash and only the recent past is
+# useful: both are capped so long-running sessions do not grow without bound
+MAX_HISTORY_ENTRIES = 256
+
+def _append_bounded(history: List[Any], entry: Any, limit: Optional[int]) -> None:
+    history.append(entry)
+    if limit is not None and len(history) > limit:
+        del history[:-limit]
+
 def _ensure_attempts(env: Dict[str, Any]) -> List[AttemptRecord]:
-    if "attempts" not in env or not isinstance(env["attempts"], list):
-        env["attempts"] = []
-    return env["attempts"]  # type: ignore
+    # One lookup covers both "missing" and "wrong type" (get() yields None)
+    attempts = env.get("attempts")
+    if not isinstance(attempts, list):
+        attempts = env["attempts"] = []
+    return attempts  # type: ignore
 
 # 1) append_attempt
 
-def append_attempt(env: Dict[str, Any], *, success: bool, note: str = "", breaker_state: Optional[BreakerState] = None, failure_count: Optional[int] = None, ts: Optional[int] = None) -> Dict[str, Any]:
+def append_attempt(env: Dict[str, Any], *, success: bool, note: str = "", breaker_state: Optional[BreakerState] = None, failure_count: Optional[int] = None, ts: Optional[int] = None, max_entries: Optional[int] = MAX_HISTORY_ENTRIES) -> Dict[str, Any]:
     attempts = _ensure_attempts(env)
     rec: AttemptRecord = {"ts": ts or _now_epoch_sec(), "success": bool(success)}
     if note:
@@ -60,7 +88,7 @@ def append_attempt(env: Dict[str, Any], *, success: bool, note: str = "", breake
         if isinstance(failure_count, int):
             b["failure_count"] = failure_count
         rec["breaker"] = b
-    attempts.append(rec)
+    _append_bounded(attempts, rec, max_entries)
     return env
 
 # 2) merge_confidence
@@ -98,9 +126,14 @@ def update_trend(env: Dict[str, Any], *, errors_detected: int, errors_resolved:
 
 # 4) set_breaker_state
 
+# Valid states mapped to their canonical string objects: one hash lookup
+# validates, and every envelope shares the same three strings
+_BREAKER_STATES: Dict[str, str] = {state: state for state in ("OPEN", "CLOSED", "HALF_OPEN")}
+
 def set_breaker_state(env: Dict[str, Any], state: BreakerState) -> Dict[str, Any]:
-    if state in ("OPEN", "CLOSED", "HALF_OPEN"):
-        env["breakerState"] = state
+    canonical = _BREAKER_STATES.get(state)
+    if canonical is not None:
+        env["breakerState"] = canonical
     return env
 
 # 5) set_cascade_depth
@@ -147,18 +180,79 @@ def set_envelope_timestamp(env: Dict[str, Any], iso: Optional[str] = None) -> Di
     env["timestamp"] = iso or _now_iso()
     return env
 
+# Envelope snapshots
+# Atomic immutables come back as-is; containers (even tuples) may hold mutables
+_IMMUTABLE_TYPES = frozenset({str, int, float, bool, type(None), bytes})
+
+def _naive_deepcopy(value: Any) -> Any:
+    """copy.deepcopy specialised for JSON-shaped envelope data.
+
+    Plain dicts and lists are rebuilt directly and scalars returned as-is;
+    anything else falls back to copy.deepcopy. There is no memo, so shared
+    sub-objects are duplicated and cycles are unsupported (envelopes are
+    JSON trees, so neither occurs).
+    """
+    kind = type(value)
+    if kind in _IMMUTABLE_TYPES:
+        return value
+    if kind is dict:
+        return {key: item if type(item) in _IMMUTABLE_TYPES else _naive_deepcopy(item)
+                for key, item in value.items()}
+    if kind is list:
+        return [item if type(item) in _IMMUTABLE_TYPES else _naive_deepcopy(item)
+                for item in value]
+    return copy.deepcopy(value)
+
+def snapshot_envelope(env: Dict[str, Any]) -> Dict[str, Any]:
+    """Independent copy of a dict envelope, e.g. for hashing or persistence."""
+    return _naive_deepcopy(env)
+
 # 10) compute_stable_envelope_hash
 VOLATILE_KEYS = {"attempts", "timestamp", "envelopeHash", "developer_message", "developerMessage", "developer_flag_reason", "timeline"}
 
+def _sha256_hex(b: bytes) -> str:
+    # hashlib already runs the digest loop in C; keep SHA-256 for parity with the TS hash
+    return hashlib.sha256(b).hexdigest()
+
 def compute_stable_envelope_hash(env: Dict[str, Any], *, sha256_hex: Callable[[bytes], str] | None = None) -> str:
     if sha256_hex is None:
-        sha256_hex = lambda b: hashlib.sha256(b).hexdigest()
+        # Stream the canonical form into the digest: no filtered copy of the
+        # envelope and no full canonical string are ever materialized
+        hasher = hashlib.sha256()
+        _update_stable_canonical(hasher.update, env)
+        return hasher.hexdigest()
     # Exclude volatile keys
     base = {k: v for k, v in env.items() if k not in VOLATILE_KEYS}
     # Deterministic ordering
     canonical = json_dumps_stable(base)
     return sha256_hex(canonical.encode("utf-8"))
 
+def _update_stable_canonical(update: Callable[[bytes], Any], env: Dict[str, Any], encoded: Optional[Dict[str, bytes]] = None) -> None:
+    """Feed json_dumps_stable(<env without volatile keys>) to ``update`` key by key.
+
+    ``encoded`` maps keys to already-encoded canonical values to reuse.
+    """
+    separator = b"{"
+    for key in sorted(k for k in env if k not in VOLATILE_KEYS):
+        update(separator)
+        update(_json.dumps(key).encode("utf-8") + b":")
+        value = encoded.get(key) if encoded else None
+        update(value if value is not None else json_dumps_stable_bytes(env[key]))
+        separator = b","
+    update(b"{}" if separator == b"{" else b"}")
+
+def hash_envelopes(envs: List[Dict[str, Any]], *, max_workers: Optional[int] = None) -> List[str]:
+    """Stable hashes for a batch of envelopes, in input order.
+
+    Canonical encoding holds the GIL and hashlib only releases it for updates
+    over ~2 KiB, so threads pay off only for large envelopes: by default the
+    batch is hashed inline; pass max_workers > 1 to fan out over a thread pool.
+    """
+    if not max_workers or max_workers <= 1 or len(envs) < 2:
+        return [compute_stable_envelope_hash(env) for env in envs]
+    with ThreadPoolExecutor(max_workers=min(max_workers, len(envs))) as pool:
+        return list(pool.map(compute_stable_envelope_hash, envs))
+
 # 11) set_envelope_hash
 
 def set_envelope_hash(env: Dict[str, Any]) -> Dict[str, Any]:
@@ -167,23 +261,28 @@ def set_envelope_hash(env: Dict[str, Any]) -> Dict[str, Any]:
 
 # 12) update_counters
 
+_KIND_COUNTERS = {"syntax": "syntaxAttempts", "logic": "logicAttempts"}
+
 def update_counters(env: Dict[str, Any], kind: str, errors_resolved: int) -> Dict[str, Any]:
-    counters = env.get("counters") or {}
-    counters["totalAttempts"] = counters.get("totalAttempts", 0) + 1
-    if kind == "syntax":
-        counters["syntaxAttempts"] = counters.get("syntaxAttempts", 0) + 1
-    if kind == "logic":
-        counters["logicAttempts"] = counters.get("logicAttempts", 0) + 1
-    counters["errorsResolvedTotal"] = counters.get("errorsResolvedTotal", 0) + max(0, int(errors_resolved))
-    env["counters"] = counters
+    counters = env.get("counters")
+    if not counters:
+        counters = env["counters"] = {}  # otherwise updated in place, no re-assignment
+    get = counters.get
+    counters["totalAttempts"] = get("totalAttempts", 0) + 1
+    kind_counter = _KIND_COUNTERS.get(kind)
+    if kind_counter is not None:
+        counters[kind_counter] = get(kind_counter, 0) + 1
+    resolved = int(errors_resolved)
+    counters["errorsResolvedTotal"] = get("errorsResolvedTotal", 0) + (resolved if resolved > 0 else 0)
     return env
 
 # 13) add_timeline_entry
 
-def add_timeline_entry(env: Dict[str, Any], *, attempt: int, errors_detected: Optional[int] = None, errors_resolved: Optional[int] = None, overall_confidence: Optional[float] = None, breaker_state: Optional[str] = None, action: Optional[str] = None) -> Dict[str, Any]:
-    if "timeline" not in env or not isinstance(env["timeline"], list):
-        env["timeline"] = []
-    env["timeline"].append({
+def add_timeline_entry(env: Dict[str, Any], *, attempt: int, errors_detected: Optional[int] = None, errors_resolved: Optional[int] = None, overall_confidence: Optional[float] = None, breaker_state: Optional[str] = None, action: Optional[str] = None, max_entries: Optional[int] = MAX_HISTORY_ENTRIES) -> Dict[str, Any]:
+    timeline = env.get("timeline")
+    if not isinstance(timeline, list):
+        timeline = env["timeline"] = []
+    _append_bounded(timeline, {
         "attempt": attempt,
         "ts": _now_iso(),
         "errorsDetected": errors_detected,
@@ -191,25 +290,38 @@ def add_timeline_entry(env: Dict[str, Any], *, attempt: int, errors_detected: Op
         "overallConfidence": overall_confidence,
         "breakerState": breaker_state,
         "action": action
-    })
+    }, max_entries)
     return env
 
 # Stable JSON (sorted keys, no whitespace differences)
 import json as _json
 
+# json.dumps builds a fresh JSONEncoder whenever non-default options are
+# passed; the canonical encoder is configured once and reused instead
+_STABLE_ENCODER = _json.JSONEncoder(sort_keys=True, separators=(",", ":"))
+
 def json_dumps_stable(obj: Any) -> str:
-    return _json.dumps(obj, sort_keys=True, separators=(",", ":"))
+    return _STABLE_ENCODER.encode(obj)
+
+def json_dumps_stable_bytes(obj: Any) -> bytes:
+    """json_dumps_stable(obj) as bytes, ready for hashing.
+
+    The output is ASCII-only (non-ASCII is escaped, as the TS hash expects),
+    so the cheaper ASCII codec yields the same bytes as UTF-8.
+    """
+    return _STABLE_ENCODER.encode(obj).encode("ascii")
 
 # Convenience to convert dataclass instance to dict (shallow)
 
 def as_envelope_dict(obj: Any) -> Dict[str, Any]:
-    if hasattr(obj, "__dict__"):
-        try:
-            return asdict(obj)  # dataclass
-        except Exception:
-            return dict(obj.__dict__)
     if isinstance(obj, dict):
         return obj
+    if is_dataclass(obj) and not isinstance(obj, type):
+        # Shallow field read: asdict() would recurse and deep-copy every value
+        return {f.name: getattr(obj, f.name) for f in fields(obj)}
+    attrs = getattr(obj, "__dict__", None)
+    if attrs is not None:
+        return dict(attrs)
     raise TypeError("Unsupported envelope object type")
 
 __all__ = [
@@ -224,8 +336,10 @@ __all__ = [
     "mark_success",
     "set_envelope_timestamp",
     "compute_stable_envelope_hash",
+    "hash_envelopes",
     "set_envelope_hash",
     "update_counters",
     "add_timeline_entry",
+    "snapshot_envelope",
     "as_envelope_dict",
 ]
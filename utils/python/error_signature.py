@@ -6,10 +6,21 @@ to prevent duplicate retry attempts on identical failures.
 """
 
 import hashlib
+import re
 import traceback
+from collections import Counter
 from typing import Dict, List, Set, Any, Optional
 from dataclasses import dataclass
 
+# First line exactly as str.splitlines()[0] would cut it
+_FIRST_LINE_RE = re.compile(r'[^\n\r\x0b\x0c\x1c-\x1e\x85\u2028\u2029]*')
+# Location noise stripped from messages, applied in this order
+_LOCATION_RES = (
+    re.compile(r'\s+at\s+.*:\d+'),  # Remove "at file:line"
+    re.compile(r'\s+in\s+/.+$'),  # Remove file paths
+    re.compile(r'File\s+"[^"]+",\s+line\s+\d+'),  # Remove Python traceback refs
+)
+
 
 @dataclass
 class ErrorSignatureData:
@@ -37,17 +48,19 @@ class ErrorSignature:
         Returns:
             Normalized error signature string
         """
-        error_type = type(err).__name__
-        message = str(err).splitlines()[0].strip() if str(err) else ""
-        
+        return ErrorSignature._signature(type(err).__name__, ErrorSignature._first_line(err))
+    
+    @staticmethod
+    def _first_line(err: Exception) -> str:
+        """First line of the exception message, stripped"""
+        return _FIRST_LINE_RE.match(str(err)).group().strip()
+    
+    @staticmethod
+    def _signature(error_type: str, message: str) -> str:
         # Remove file paths and line numbers to focus on error content
-        import re
-        clean_message = re.sub(r'\s+at\s+.*:\d+', '', message)  # Remove "at file:line"
-        clean_message = re.sub(r'\s+in\s+/.+$', '', clean_message)  # Remove file paths
-        clean_message = re.sub(r'File\s+"[^"]+",\s+line\s+\d+', '', clean_message)  # Remove Python traceback refs
-        clean_message = clean_message.strip()
-        
-        return f"{error_type}:{clean_message}"
+        for pattern in _LOCATION_RES:
+            message = pattern.sub('', message)
+        return f"{error_type}:{message.strip()}"
     
     @staticmethod
     def create(err: Exception) -> ErrorSignatureData:
@@ -60,18 +73,17 @@ class ErrorSignature:
         Returns:
             Detailed error signature with metadata
         """
-        error_type = type(err).__name__
-        message = str(err).splitlines()[0].strip() if str(err) else ""
-        signature = ErrorSignature.normalize(err)
-        
-        # Simple hash for deduplication
-        hash_value = ErrorSignature._simple_hash(signature)
-        
+        return ErrorSignature._data(err, ErrorSignature.normalize(err))
+    
+    @staticmethod
+    def _data(err: Exception, signature: str) -> ErrorSignatureData:
+        """Signature data for err, given its already normalized signature"""
         return ErrorSignatureData(
             signature=signature,
-            type=error_type,
-            message=message,
-            hash=hash_value
+            type=type(err).__name__,
+            message=ErrorSignature._first_line(err),
+            # Simple hash for deduplication
+            hash=ErrorSignature._simple_hash(signature)
         )
     
     @staticmethod
@@ -99,7 +111,9 @@ class ErrorSignature:
         Returns:
             Simple hash value as hex string
         """
-        return hashlib.md5(text.encode('utf-8')).hexdigest()[:8]
+        # MD5 prefix for parity with the PHP port (substr(md5($str), 0, 8));
+        # not a security use, so FIPS-restricted builds still allow it
+        return hashlib.md5(text.encode('utf-8'), usedforsecurity=False).hexdigest()[:8]
 
 
 class ErrorTracker:
@@ -110,6 +124,24 @@ class ErrorTracker:
     def __init__(self):
         self.seen_errors: Set[str] = set()
         self.error_history: List[ErrorSignatureData] = []
+        # Maintained by record() so stats queries never rescan the history
+        self._counts: Counter = Counter()
+        self._unique: Dict[str, ErrorSignatureData] = {}
+        # has_seen() followed by record() would normalize the same exception
+        # twice: remember (id, type, args, signature) of the last one. Built-in
+        # exceptions can't be weakly referenced; the held args tuple (not the
+        # exception) stops a new exception that reuses the id from matching.
+        self._last_signature: Optional[tuple] = None
+    
+    def _signature_of(self, err: Exception) -> str:
+        """ErrorSignature.normalize(err), memoized while err.args is unchanged"""
+        args = err.args
+        cached = self._last_signature
+        if cached is not None and cached[0] == id(err) and cached[1] is type(err) and cached[2] is args:
+            return cached[3]
+        signature = ErrorSignature.normalize(err)
+        self._last_signature = (id(err), type(err), args, signature)
+        return signature
     
     def has_seen(self, err: Exception) -> bool:
         """
@@ -121,8 +153,7 @@ class ErrorTracker:
         Returns:
             True if this error signature was already seen
         """
-        signature = ErrorSignature.normalize(err)
-        return signature in self.seen_errors
+        return self._signature_of(err) in self.seen_errors
     
     def record(self, err: Exception) -> ErrorSignatureData:
         """
@@ -134,11 +165,28 @@ class ErrorTracker:
         Returns:
             The error signature that was recorded
         """
-        error_sig = ErrorSignature.create(err)
+        error_sig = ErrorSignature._data(err, self._signature_of(err))
         self.seen_errors.add(error_sig.signature)
         self.error_history.append(error_sig)
+        self._counts[error_sig.signature] += 1
+        self._unique.setdefault(error_sig.signature, error_sig)
         return error_sig
     
+    def record_if_new(self, err: Exception) -> bool:
+        """
+        Record an exception only if its signature has not been seen yet
+        
+        Args:
+            err: Exception to check and record
+            
+        Returns:
+            True if the error was new and has been recorded
+        """
+        if self._signature_of(err) in self.seen_errors:
+            return False
+        self.record(err)
+        return True
+    
     def get_unique_errors(self) -> List[ErrorSignatureData]:
         """
         Get all unique error signatures seen so far
@@ -146,16 +194,15 @@ class ErrorTracker:
         Returns:
             List of unique error signatures
         """
-        unique = {}
-        for err in self.error_history:
-            if err.signature not in unique:
-                unique[err.signature] = err
-        return list(unique.values())
+        return list(self._unique.values())
     
     def clear(self) -> None:
         """Clear all tracked errors"""
         self.seen_errors.clear()
         self.error_history.clear()
+        self._counts.clear()
+        self._unique.clear()
+        self._last_signature = None
     
     def get_error_counts(self) -> Dict[str, int]:
         """
@@ -164,10 +211,7 @@ class ErrorTracker:
         Returns:
             Dictionary mapping error signature to count
         """
-        counts = {}
-        for err in self.error_history:
-            counts[err.signature] = counts.get(err.signature, 0) + 1
-        return counts
+        return dict(self._counts)
     
     def get_most_frequent_errors(self, limit: int = 5) -> List[tuple]:
         """
@@ -179,5 +223,5 @@ class ErrorTracker:
         Returns:
             List of (error_signature, count) tuples sorted by frequency
         """
-        counts = self.get_error_counts()
-        return sorted(counts.items(), key=lambda x: x[1], reverse=True)[:limit]
\ No newline at end of file
+        # Ties keep first-seen order, as the previous sorted() did
+        return self._counts.most_common(limit)
\ No newline at end of file
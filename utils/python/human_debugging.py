@@ -1,5 +1,6 @@
 import json
-from typing import Dict, Any, List
+from functools import lru_cache
+from typing import Dict, Any, List, Optional
 from abc import ABC, abstractmethod
 
 class HumanDebuggingHeuristic(ABC):
@@ -7,37 +8,99 @@ class HumanDebuggingHeuristic(ABC):
     def analyze_error(self, error: str, context: Dict[str, Any]) -> Dict[str, Any]:
         pass
 
+class _FrozenResult(dict):
+    """Read-only dict for heuristic results shared across calls.
+
+    Still a real dict, so json.dumps and equality work unchanged (a
+    MappingProxyType would not serialize).
+    """
+    __slots__ = ()
+
+    def _readonly(self, *args, **kwargs):
+        raise TypeError("heuristic results are shared and read-only; copy with dict() first")
+
+    __setitem__ = __delitem__ = __ior__ = _readonly
+    clear = pop = popitem = setdefault = update = _readonly
+
+    def __reduce__(self):
+        # copy/deepcopy/pickle hand back a plain, mutable dict
+        return (dict, (dict(self),))
+
 class PathAnalysisHeuristic(HumanDebuggingHeuristic):
+    # Error keywords in priority order, each with the (shared) analysis it implies
+    FINDINGS = (
+        ("undefined", _FrozenResult(
+            heuristic="PathAnalysis",
+            analysis="Likely a path resolution issue",
+            suggested_fixes=("Check file paths", "Use absolute paths", "Verify constants"),
+            confidence=0.8)),
+        ("overflow", _FrozenResult(
+            heuristic="PathAnalysis",
+            analysis="Buffer or stack overflow detected",
+            suggested_fixes=("Add bounds checking", "Use safer data structures", "Implement circuit breaker"),
+            confidence=0.9)),
+    )
+    UNKNOWN = _FrozenResult(heuristic="PathAnalysis", analysis="Unknown pattern", confidence=0.1)
+
     def analyze_error(self, error: str, context: Dict[str, Any]) -> Dict[str, Any]:
         # Simulate human-like path analysis
-        if "undefined" in error.lower():
-            return {
-                "heuristic": "PathAnalysis",
-                "analysis": "Likely a path resolution issue",
-                "suggested_fixes": ["Check file paths", "Use absolute paths", "Verify constants"],
-                "confidence": 0.8
-            }
-        elif "overflow" in error.lower():
-            return {
-                "heuristic": "PathAnalysis", 
-                "analysis": "Buffer or stack overflow detected",
-                "suggested_fixes": ["Add bounds checking", "Use safer data structures", "Implement circuit breaker"],
-                "confidence": 0.9
-            }
-        return {"heuristic": "PathAnalysis", "analysis": "Unknown pattern", "confidence": 0.1}
+        lowered = error.lower()  # lowered once, not once per keyword
+        for keyword, finding in self.FINDINGS:
+            if keyword in lowered:
+                return finding
+        return self.UNKNOWN
 
 class MentalSimulationHeuristic(HumanDebuggingHeuristic):
+    MISSING_ELSE = _FrozenResult(
+        heuristic="MentalSimulation",
+        analysis="Missing else clause could cause unexpected behavior",
+        suggested_fixes=("Add else clause", "Use switch statement", "Add default case"),
+        confidence=0.7)
+    NORMAL_FLOW = _FrozenResult(heuristic="MentalSimulation", analysis="Code flow appears normal", confidence=0.5)
+
     def analyze_error(self, error: str, context: Dict[str, Any]) -> Dict[str, Any]:
         # Simulate mental walkthrough of code execution
         code_snippet = context.get("code_snippet", "")
         if "if" in code_snippet and "else" not in code_snippet:
-            return {
-                "heuristic": "MentalSimulation",
-                "analysis": "Missing else clause could cause unexpected behavior",
-                "suggested_fixes": ["Add else clause", "Use switch statement", "Add default case"],
-                "confidence": 0.7
-            }
-        return {"heuristic": "MentalSimulation", "analysis": "Code flow appears normal", "confidence": 0.5}
+            return self.MISSING_ELSE
+        return self.NORMAL_FLOW
+
+@lru_cache(maxsize=64)
+def _analysis_category(analysis: str) -> Optional[str]:
+    """"path" or "overflow" for an analysis text, checked in that order.
+
+    Heuristics return a handful of fixed analysis strings, so each text is
+    lowered and scanned once rather than on every strategy/steps lookup.
+    """
+    lowered = analysis.lower()
+    if "path" in lowered:
+        return "path"
+    if "overflow" in lowered:
+        return "overflow"
+    return None
+
+# Dispatch tables keyed by _analysis_category; path issues are often safer rolled back
+_STRATEGY_BY_CATEGORY = {"path": "RollbackStrategy", "overflow": "SecurityAuditStrategy"}
+_STEPS_BY_CATEGORY = {
+    "path": (
+        "1. Reproduce the error in isolation",
+        "2. Check all file/directory paths for existence",
+        "3. Verify path constants and environment variables",
+        "4. Test with absolute paths as fallback",
+        "5. Test fix and monitor for regressions"
+    ),
+    "overflow": (
+        "1. Reproduce the error in isolation",
+        "2. Add logging for buffer sizes and indices",
+        "3. Implement bounds checking",
+        "4. Consider using safer data structures",
+        "5. Test fix and monitor for regressions"
+    ),
+    None: (
+        "1. Reproduce the error in isolation",
+        "5. Test fix and monitor for regressions"
+    ),
+}
 
 class SeniorDeveloperSimulator:
     def __init__(self):
@@ -48,14 +111,18 @@ class SeniorDeveloperSimulator:
     
     def debug_like_human(self, error: str, context: Dict[str, Any]) -> Dict[str, Any]:
         analyses = []
+        best_analysis = None
         for heuristic in self.heuristics:
             analysis = heuristic.analyze_error(error, context)
-            if analysis["confidence"] > 0.5:  # Only include confident analyses
+            confidence = analysis["confidence"]
+            if confidence > 0.5:  # Only include confident analyses
                 analyses.append(analysis)
+                # Senior developer would prioritize highest confidence analysis
+                # (first one wins ties, as max() did)
+                if best_analysis is None or confidence > best_analysis["confidence"]:
+                    best_analysis = analysis
         
-        # Senior developer would prioritize highest confidence analysis
-        if analyses:
-            best_analysis = max(analyses, key=lambda x: x["confidence"])
+        if best_analysis is not None:
             return {
                 "human_debugging_approach": True,
                 "primary_analysis": best_analysis,
@@ -71,29 +138,10 @@ class SeniorDeveloperSimulator:
             }
     
     def _map_to_strategy(self, analysis: Dict[str, Any]) -> str:
-        if "path" in analysis["analysis"].lower():
-            return "RollbackStrategy"  # Often safer for path issues
-        elif "overflow" in analysis["analysis"].lower():
-            return "SecurityAuditStrategy"
-        else:
-            return "LogAndFixStrategy"
+        return _STRATEGY_BY_CATEGORY.get(_analysis_category(analysis["analysis"]), "LogAndFixStrategy")
     
     def _generate_debug_steps(self, analysis: Dict[str, Any]) -> List[str]:
-        steps = ["1. Reproduce the error in isolation"]
-        if "path" in analysis["analysis"].lower():
-            steps.extend([
-                "2. Check all file/directory paths for existence",
-                "3. Verify path constants and environment variables",
-                "4. Test with absolute paths as fallback"
-            ])
-        elif "overflow" in analysis["analysis"].lower():
-            steps.extend([
-                "2. Add logging for buffer sizes and indices", 
-                "3. Implement bounds checking",
-                "4. Consider using safer data structures"
-            ])
-        steps.append("5. Test fix and monitor for regressions")
-        return steps
+        return list(_STEPS_BY_CATEGORY[_analysis_category(analysis["analysis"])])
 
 # Usage example
 if __name__ == "__main__":
@@ -1,35 +1,97 @@
 import json
+import queue
+import sys
+import threading
+import traceback
+import weakref
 from abc import ABC, abstractmethod
-from typing import List, Dict, Any
+from datetime import datetime
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+_SCALAR_TYPES = (str, int, float, bool, type(None))
+_encode_compact = json.JSONEncoder().encode  # C-accelerated; indent=2 is not
+
+
+def _dumps_indented(record: Dict[str, Any]) -> str:
+    """json.dumps(record, indent=2), taking a fast path for flat records.
+
+    json only uses its C encoder without indentation; for a flat record of
+    scalars the indented layout is simple enough to assemble from compactly
+    encoded keys and values.
+    """
+    if not record or not all(type(key) is str and type(value) in _SCALAR_TYPES
+                             for key, value in record.items()):
+        return json.dumps(record, indent=2)
+    lines = ",\n".join(
+        f"  {_encode_compact(key)}: {_encode_compact(value)}" for key, value in record.items()
+    )
+    return f"{{\n{lines}\n}}"
+
 
 class Observer(ABC):
+    __slots__ = ()
+
     @abstractmethod
     def update(self, subject: 'Subject', data: Dict[str, Any]) -> None:
         pass
 
+    def update_batch(self, subject: 'Subject', batch: List[Dict[str, Any]]) -> None:
+        """Receive several events at once (asynchronous ErrorHandler).
+
+        Defaults to one update() per event; override to handle the batch as a unit.
+        """
+        update = self.update
+        for data in batch:
+            update(subject, data)
+
 class Subject:
+    __slots__ = ("_observers", "_callbacks", "_batch_callbacks")
+
     def __init__(self):
-        self._observers: List[Observer] = []
+        # Attached observers keyed by id(): O(1) identity membership checks
+        # without calling observer __eq__; dict order keeps attach order
+        self._observers: Dict[int, Observer] = {}
+        # Bound update methods, rebuilt only on attach/detach so notify does
+        # no per-observer attribute lookup
+        self._callbacks: Tuple[Callable[['Subject', Dict[str, Any]], None], ...] = ()
+        self._batch_callbacks: Tuple[Callable[['Subject', List[Dict[str, Any]]], None], ...] = ()
 
     def attach(self, observer: Observer) -> None:
-        if observer not in self._observers:
-            self._observers.append(observer)
+        key = id(observer)
+        if key not in self._observers:
+            self._observers[key] = observer
+            self._refresh_callbacks()
 
     def detach(self, observer: Observer) -> None:
-        try:
-            self._observers.remove(observer)
-        except ValueError:
-            pass
+        if self._observers.pop(id(observer), None) is not None:
+            self._refresh_callbacks()
+
+    def _refresh_callbacks(self) -> None:
+        observers = self._observers.values()
+        self._callbacks = tuple(observer.update for observer in observers)
+        self._batch_callbacks = tuple(observer.update_batch for observer in observers)
 
     def notify(self, data: Dict[str, Any]) -> None:
-        for observer in self._observers:
-            observer.update(self, data)
+        # Iterates a snapshot: observers detached mid-notify do not skip others
+        for callback in self._callbacks:
+            callback(self, data)
 
 class PatchObserver(Observer):
+    __slots__ = ("name",)
+
     def __init__(self, name: str):
         self.name = name
 
     def update(self, subject: 'Subject', data: Dict[str, Any]) -> None:
+        # One write per update instead of print's separate text and newline writes
+        sys.stdout.write(self._render(data))
+        # In a real system, this could be sent to a logging service or AI feedback loop
+
+    def update_batch(self, subject: 'Subject', batch: List[Dict[str, Any]]) -> None:
+        # The whole batch goes out in a single write
+        sys.stdout.write("".join(map(self._render, batch)))
+
+    def _render(self, data: Dict[str, Any]) -> str:
         # Process patch outcome and serialize to JSON
         outcome = {
             "observer": self.name,
@@ -38,21 +100,87 @@ class PatchObserver(Observer):
             "details": data.get("details", ""),
             "timestamp": data.get("timestamp", "")
         }
-        json_output = json.dumps(outcome, indent=2)
-        print(f"Observer {self.name} received update: {json_output}")
-        # In a real system, this could be sent to a logging service or AI feedback loop
+        return f"Observer {self.name} received update: {_dumps_indented(outcome)}\n"
+
+# Queued after the last event to stop an asynchronous ErrorHandler's thread
+_STOP = object()
+
+def _dispatch_loop(pending: "queue.Queue[Any]", handler_ref: "weakref.ref[ErrorHandler]", max_batch: int) -> None:
+    # Holds only the queue and a weak reference, so the handler can be collected
+    while True:
+        batch = [pending.get()]
+        try:
+            while len(batch) < max_batch:
+                batch.append(pending.get_nowait())
+        except queue.Empty:
+            pass
+        events = [data for data in batch if data is not _STOP]
+        handler = handler_ref()
+        if handler is not None and events:
+            for callback in handler._batch_callbacks:
+                try:
+                    callback(handler, events)
+                except Exception:
+                    traceback.print_exc()  # a failing observer must not stop delivery
+        del handler
+        for _ in batch:
+            pending.task_done()
+        if len(events) != len(batch):
+            return
 
 class ErrorHandler(Subject):
-    def __init__(self):
+    __slots__ = ("_queue", "_thread", "__weakref__")
+
+    def __init__(self, asynchronous: bool = False, max_pending: int = 10_000, max_batch: int = 256):
+        """With asynchronous=True, handle_error only enqueues the event and a
+        daemon thread hands queued events to each observer's update_batch in
+        batches of up to max_batch, so slow observers (JSON + console output)
+        never block the erroring code path. The queue holds at most max_pending
+        events (producers block beyond it); call flush() to wait until every
+        queued event has been delivered and close() to stop the thread (it also
+        stops once the handler is garbage collected)."""
         super().__init__()
+        self._queue: Optional["queue.Queue[Any]"] = None
+        self._thread: Optional[threading.Thread] = None
+        if asynchronous:
+            self._queue = queue.Queue(maxsize=max_pending)
+            self._thread = threading.Thread(
+                target=_dispatch_loop, args=(self._queue, weakref.ref(self), max_batch),
+                name="ErrorHandler-dispatch", daemon=True)
+            self._thread.start()
+            weakref.finalize(self, self._queue.put, _STOP)
 
     def handle_error(self, error: str, patch_name: str = "") -> None:
         data = {
             "error": error,
             "patch_name": patch_name,
-            "timestamp": str(__import__('datetime').datetime.now())
+            "timestamp": datetime.now().isoformat(sep=" ")  # same text str() gave
         }
-        self.notify(data)
+        # Read the queue once: close() may clear it between a check and a put
+        pending = self._queue
+        if pending is None:
+            self.notify(data)
+        else:
+            pending.put(data)
+
+    def flush(self) -> None:
+        """Block until all queued events have been delivered (no-op when synchronous)"""
+        pending = self._queue
+        if pending is not None:
+            pending.join()
+
+    def close(self) -> None:
+        """Deliver everything queued, then stop the dispatch thread.
+
+        Events handled after close() are delivered synchronously.
+        """
+        pending, thread = self._queue, self._thread
+        if pending is None:
+            return
+        self._queue = self._thread = None
+        pending.put(_STOP)
+        if thread is not threading.current_thread():
+            thread.join()
 
 # Usage example
 if __name__ == "__main__":
@@ -5,7 +5,7 @@ from dataclasses import dataclass
 import time
 import random
 
-@dataclass
+@dataclass(slots=True)
 class SimulationResult:
     success: bool
     execution_time: float
@@ -14,40 +14,82 @@ class SimulationResult:
     error_trace: str = ""
     circuit_breaker_tripped: bool = False
 
+# Breaker states as small ints: the hot path compares ints, not strings
+_CLOSED, _OPEN, _HALF_OPEN = 0, 1, 2
+_STATE_NAMES = ("CLOSED", "OPEN", "HALF_OPEN")
+_STATE_CODES = {name: code for code, name in enumerate(_STATE_NAMES)}
+
 class CircuitBreaker:
+    # recovery_timeout and state are properties over _recovery_ns and _state
+    __slots__ = ("failure_threshold", "failure_count", "_recovery_ns", "_last_failure_ns", "_state")
+
     def __init__(self, failure_threshold: int = 3, recovery_timeout: float = 60.0):
         self.failure_threshold = failure_threshold
         self.recovery_timeout = recovery_timeout
         self.failure_count = 0
-        self.last_failure_time = 0
-        self.state = "CLOSED"  # CLOSED, OPEN, HALF_OPEN
+        # Monotonic clock in integer ns: immune to wall-clock jumps, and the
+        # recovery check is a plain integer comparison
+        self._last_failure_ns = 0
+        self._state = _CLOSED
+    
+    @property
+    def state(self) -> str:
+        """CLOSED, OPEN or HALF_OPEN"""
+        return _STATE_NAMES[self._state]
+    
+    @state.setter
+    def state(self, name: str) -> None:
+        self._state = _STATE_CODES[name]
+    
+    @property
+    def recovery_timeout(self) -> float:
+        return self._recovery_ns / 1e9
+    
+    @recovery_timeout.setter
+    def recovery_timeout(self, seconds: float) -> None:
+        self._recovery_ns = int(seconds * 1e9)
+    
+    @property
+    def last_failure_time(self) -> float:
+        """Wall-clock time of the last failure (0 if none), derived on demand"""
+        if not self._last_failure_ns:
+            return 0
+        return time.time() - (time.monotonic_ns() - self._last_failure_ns) / 1e9
     
     def call(self, func, *args, **kwargs):
-        if self.state == "OPEN":
-            if time.time() - self.last_failure_time > self.recovery_timeout:
-                self.state = "HALF_OPEN"
+        # Successful CLOSED calls never read the clock; an OPEN breaker reads
+        # it once, and a failed trial call records that same reading
+        now_ns = 0
+        if self._state == _OPEN:
+            now_ns = time.monotonic_ns()
+            if now_ns - self._last_failure_ns > self._recovery_ns:
+                self._state = _HALF_OPEN
             else:
                 raise Exception("Circuit breaker is OPEN")
         
         try:
             result = func(*args, **kwargs)
+        except Exception:
+            self._on_failure(now_ns or time.monotonic_ns())
+            raise
+        # Healthy steady state (CLOSED, no failures) has nothing to reset
+        if self.failure_count or self._state != _CLOSED:
             self._on_success()
-            return result
-        except Exception as e:
-            self._on_failure()
-            raise e
+        return result
     
     def _on_success(self):
         self.failure_count = 0
-        self.state = "CLOSED"
+        self._state = _CLOSED
     
-    def _on_failure(self):
+    def _on_failure(self, now_ns: int):
         self.failure_count += 1
-        self.last_failure_time = time.time()
+        self._last_failure_ns = now_ns
         if self.failure_count >= self.failure_threshold:
-            self.state = "OPEN"
+            self._state = _OPEN
 
 class CodeSimulator(ABC):
+    __slots__ = ("circuit_breaker",)
+
     def __init__(self):
         self.circuit_breaker = CircuitBreaker()
     
@@ -56,36 +98,17 @@ class CodeSimulator(ABC):
         pass
 
 class InMemorySimulator(CodeSimulator):
+    __slots__ = ("simulate_latency",)
+
+    def __init__(self, simulate_latency: bool = False):
+        """simulate_latency=True really sleeps for the drawn processing time;
+        by default the drawn time is only reported, so simulations are instant."""
+        super().__init__()
+        self.simulate_latency = simulate_latency
+
     def simulate_patch(self, code_base: str, patch: Dict[str, Any]) -> SimulationResult:
-        def _simulate():
-            # Simulate execution without actually running code
-            import time
-            start_time = time.time()
-            
-            # Mock simulation logic with potential failures
-            simulated_errors = []
-            if "buffer_overflow" in patch.get("vulnerability", ""):
-                if random.random() < 0.3:  # 30% chance of simulation failure
-                    raise Exception("Simulation detected critical buffer overflow")
-                simulated_errors.append("Potential buffer overflow detected in simulation")
-            
-            # Simulate some processing time with jitter
-            processing_time = random.uniform(0.1, 1.0)
-            time.sleep(processing_time)
-            
-            execution_time = time.time() - start_time
-            memory_usage = len(code_base) * 10  # Mock memory calculation
-            
-            return SimulationResult(
-                success=len(simulated_errors) == 0,
-                execution_time=execution_time,
-                memory_usage=memory_usage,
-                side_effects=simulated_errors,
-                error_trace="; ".join(simulated_errors) if simulated_errors else ""
-            )
-        
         try:
-            return self.circuit_breaker.call(_simulate)
+            return self.circuit_breaker.call(self._simulate, code_base, patch)
         except Exception as e:
             return SimulationResult(
                 success=False,
@@ -93,10 +116,59 @@ class InMemorySimulator(CodeSimulator):
                 memory_usage=0,
                 side_effects=[],
                 error_trace=str(e),
-                circuit_breaker_tripped=self.circuit_breaker.state == "OPEN"
+                circuit_breaker_tripped=self.circuit_breaker._state == _OPEN
             )
 
+    def _simulate(self, code_base: str, patch: Dict[str, Any]) -> SimulationResult:
+        # Simulate execution without actually running code. A method rather
+        # than a closure, so nothing is rebuilt per simulate_patch call.
+        start_time = time.time() if self.simulate_latency else 0.0
+        
+        # Mock simulation logic with potential failures
+        simulated_errors = []
+        if "buffer_overflow" in patch.get("vulnerability", ""):
+            if random.random() < 0.3:  # 30% chance of simulation failure
+                raise Exception("Simulation detected critical buffer overflow")
+            simulated_errors.append("Potential buffer overflow detected in simulation")
+        
+        # Simulate some processing time with jitter
+        processing_time = random.uniform(0.1, 1.0)
+        if self.simulate_latency:
+            time.sleep(processing_time)
+            execution_time = time.time() - start_time
+        else:
+            execution_time = processing_time
+        
+        return SimulationResult(
+            success=not simulated_errors,
+            execution_time=execution_time,
+            memory_usage=len(code_base) * 10,  # Mock memory calculation
+            side_effects=simulated_errors,
+            error_trace="; ".join(simulated_errors)
+        )
+
 class AISimulationStrategy(DebuggingStrategy):
+    __slots__ = ("simulator",)
+
+    # Outcome shapes with the static fields filled in (see strategy.py);
+    # execute copies one and sets the per-call slots in place
+    _PASSED_TEMPLATE = {
+        "strategy": "AISimulationStrategy",
+        "simulation_passed": True,
+        "patch_applied": True,
+        "simulation_details": None,
+        "success": True,
+        "details": "Patch simulated successfully and applied"
+    }
+    _FAILED_TEMPLATE = {
+        "strategy": "AISimulationStrategy",
+        "simulation_passed": False,
+        "patch_applied": False,
+        "simulation_details": None,
+        "success": False,
+        "details": ""
+    }
+
     def __init__(self, simulator: CodeSimulator):
         self.simulator = simulator
 
@@ -109,33 +181,22 @@ class AISimulationStrategy(DebuggingStrategy):
         
         if simulation.success:
             # Proceed with actual application
-            outcome = {
-                "strategy": "AISimulationStrategy",
-                "simulation_passed": True,
-                "patch_applied": True,
-                "simulation_details": {
-                    "execution_time": simulation.execution_time,
-                    "memory_usage": simulation.memory_usage,
-                    "side_effects": simulation.side_effects
-                },
-                "success": True,
-                "details": "Patch simulated successfully and applied"
+            outcome = self._PASSED_TEMPLATE.copy()
+            outcome["simulation_details"] = {
+                "execution_time": simulation.execution_time,
+                "memory_usage": simulation.memory_usage,
+                "side_effects": simulation.side_effects
             }
         else:
             # Simulation failed - don't apply
-            outcome = {
-                "strategy": "AISimulationStrategy", 
-                "simulation_passed": False,
-                "patch_applied": False,
-                "simulation_details": {
-                    "execution_time": simulation.execution_time,
-                    "memory_usage": simulation.memory_usage,
-                    "side_effects": simulation.side_effects,
-                    "error_trace": simulation.error_trace
-                },
-                "success": False,
-                "details": f"Simulation failed: {simulation.error_trace}"
+            outcome = self._FAILED_TEMPLATE.copy()
+            outcome["simulation_details"] = {
+                "execution_time": simulation.execution_time,
+                "memory_usage": simulation.memory_usage,
+                "side_effects": simulation.side_effects,
+                "error_trace": simulation.error_trace
             }
+            outcome["details"] = f"Simulation failed: {simulation.error_trace}"
         
         return outcome
 
@@ -3,64 +3,81 @@ from abc import ABC, abstractmethod
 from typing import Dict, Any
 
 class DebuggingStrategy(ABC):
+    __slots__ = ()
+
     @abstractmethod
     def execute(self, context: Dict[str, Any]) -> Dict[str, Any]:
         pass
 
 class LogAndFixStrategy(DebuggingStrategy):
+    __slots__ = ()
+    # Outcome shape with the static fields filled in; execute copies it and
+    # overwrites the per-call slots, keeping the key order of the output
+    _TEMPLATE = {
+        "strategy": "LogAndFixStrategy",
+        "error": "",
+        "fix": "",
+        "success": True,
+        "details": "Error logged and basic fix applied"
+    }
+
     def execute(self, context: Dict[str, Any]) -> Dict[str, Any]:
         error = context.get("error", "")
         # Simulate logging and fixing
-        fix = f"Logged and fixed: {error}"
-
-        outcome = {
-            "strategy": "LogAndFixStrategy",
-            "error": error,
-            "fix": fix,
-            "success": True,
-            "details": "Error logged and basic fix applied"
-        }
+        outcome = self._TEMPLATE.copy()
+        outcome["error"] = error
+        outcome["fix"] = f"Logged and fixed: {error}"
         return outcome
 
 class RollbackStrategy(DebuggingStrategy):
+    __slots__ = ()
+    _TEMPLATE = {
+        "strategy": "RollbackStrategy",
+        "error": "",
+        "rollback_action": "",
+        "success": True,
+        "details": "Changes rolled back to previous stable state"
+    }
+
     def execute(self, context: Dict[str, Any]) -> Dict[str, Any]:
         error = context.get("error", "")
         # Simulate rollback
-        rollback_action = f"Rolled back changes due to: {error}"
-
-        outcome = {
-            "strategy": "RollbackStrategy",
-            "error": error,
-            "rollback_action": rollback_action,
-            "success": True,
-            "details": "Changes rolled back to previous stable state"
-        }
+        outcome = self._TEMPLATE.copy()
+        outcome["error"] = error
+        outcome["rollback_action"] = f"Rolled back changes due to: {error}"
         return outcome
 
 class SecurityAuditStrategy(DebuggingStrategy):
+    __slots__ = ()
+    _TEMPLATE = {
+        "strategy": "SecurityAuditStrategy",
+        "vulnerability": "",
+        "audit_result": "",
+        "success": True,
+        "details": "Security vulnerability addressed"
+    }
+
     def execute(self, context: Dict[str, Any]) -> Dict[str, Any]:
         vulnerability = context.get("vulnerability", "")
         # Simulate security audit and patch
-        audit_result = f"Security audit passed for: {vulnerability}"
-
-        outcome = {
-            "strategy": "SecurityAuditStrategy",
-            "vulnerability": vulnerability,
-            "audit_result": audit_result,
-            "success": True,
-            "details": "Security vulnerability addressed"
-        }
+        outcome = self._TEMPLATE.copy()
+        outcome["vulnerability"] = vulnerability
+        outcome["audit_result"] = f"Security audit passed for: {vulnerability}"
         return outcome
 
 class Debugger:
+    __slots__ = ("_strategy", "_execute")
+
     def __init__(self, strategy: DebuggingStrategy):
-        self._strategy = strategy
+        self.set_strategy(strategy)
 
     def set_strategy(self, strategy: DebuggingStrategy) -> None:
         self._strategy = strategy
+        # Bound once here so debug is a single call, not a lookup per dispatch
+        self._execute = strategy.execute
 
     def debug(self, context: Dict[str, Any]) -> Dict[str, Any]:
-        return self._strategy.execute(context)
+        return self._execute(context)
 
 # Usage example
 if __name__ == "__main__":
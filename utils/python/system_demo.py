@@ -8,9 +8,45 @@ from confidence_scoring import (
     ConfidenceScore, CircuitState
 )
 from cascading_error_handler import SandboxExecution, CascadingErrorHandler, Environment
+import functools
+import io
 import json
+import sys
+from contextlib import redirect_stdout
 from datetime import datetime
-
+from enum import Enum
+
+# One encoder shared by every pretty-printed block; json.dumps(indent=2)
+# would construct a fresh JSONEncoder on each call
+_PRETTY_ENCODER = json.JSONEncoder(indent=2)
+
+def _json_ready(obj):
+    """Copy of obj with Enum keys/values (e.g. ErrorType) replaced by their values"""
+    if isinstance(obj, dict):
+        return {_json_ready(k): _json_ready(v) for k, v in obj.items()}
+    if isinstance(obj, (list, tuple)):
+        return [_json_ready(v) for v in obj]
+    if isinstance(obj, Enum):
+        return obj.value
+    return obj
+
+def _pretty(obj) -> str:
+    return _PRETTY_ENCODER.encode(_json_ready(obj))
+
+def _buffered_output(demo):
+    """Collect a demo's prints in memory and write them to stdout in one go"""
+    @functools.wraps(demo)
+    def run(*args, **kwargs):
+        buffer = io.StringIO()
+        try:
+            with redirect_stdout(buffer):
+                return demo(*args, **kwargs)
+        finally:
+            sys.stdout.write(buffer.getvalue())
+            sys.stdout.flush()
+    return run
+
+@_buffered_output
 def demonstrate_confidence_scoring():
     """Demonstrate the unified confidence scoring system"""
     print("🔬 UNIFIED CONFIDENCE SCORING DEMO")
@@ -19,69 +55,53 @@ def demonstrate_confidence_scoring():
     # Initialize the confidence scorer
     scorer = UnifiedConfidenceScorer(temperature=1.0, calibration_samples=1000)
 
-    # Example logits from different scenarios
-    scenarios = [
-        {
-            "name": "High confidence syntax error",
-            "logits": [2.5, 0.1, 0.05],  # Strong preference for first option
-            "error_type": ErrorType.SYNTAX,
-            "historical_data": {
-                "success_rate": 0.95,
-                "pattern_similarity": 0.9,
-                "complexity_score": 2.0,
-                "test_coverage": 0.8
-            }
-        },
-        {
-            "name": "Moderate confidence logic error",
-            "logits": [1.2, 1.0, 0.8],  # Less clear preference
-            "error_type": ErrorType.LOGIC,
-            "historical_data": {
-                "success_rate": 0.75,
-                "pattern_similarity": 0.6,
-                "complexity_score": 4.5,
-                "test_coverage": 0.6
-            }
-        },
-        {
-            "name": "Low confidence runtime error",
-            "logits": [0.8, 0.7, 0.9],  # Very close probabilities
-            "error_type": ErrorType.RUNTIME,
-            "historical_data": {
-                "success_rate": 0.5,
-                "pattern_similarity": 0.3,
-                "complexity_score": 7.0,
-                "test_coverage": 0.4
-            }
-        }
+    # Example scenarios, stored column-wise: the scorer takes the logits,
+    # error types and historical data as parallel rows in one batched call
+    names = [
+        "High confidence syntax error",
+        "Moderate confidence logic error",
+        "Low confidence runtime error"
+    ]
+    logits_rows = [
+        [2.5, 0.1, 0.05],  # Strong preference for first option
+        [1.2, 1.0, 0.8],   # Less clear preference
+        [0.8, 0.7, 0.9]    # Very close probabilities
+    ]
+    error_types = [ErrorType.SYNTAX, ErrorType.LOGIC, ErrorType.RUNTIME]
+    historical_rows = [
+        {"success_rate": 0.95, "pattern_similarity": 0.9, "complexity_score": 2.0, "test_coverage": 0.8},
+        {"success_rate": 0.75, "pattern_similarity": 0.6, "complexity_score": 4.5, "test_coverage": 0.6},
+        {"success_rate": 0.5, "pattern_similarity": 0.3, "complexity_score": 7.0, "test_coverage": 0.4}
     ]
 
-    for scenario in scenarios:
-        print(f"\n📊 {scenario['name']}:")
-        print(f"   Logits: {scenario['logits']}")
-        print(f"   Error Type: {scenario['error_type']}")
+    # Calculate confidence for every scenario at once
+    confidence_scores = scorer.calculate_confidence_rows(
+        logits_rows, error_types, historical_rows=historical_rows
+    )
 
-        # Calculate confidence
-        confidence_score = scorer.calculate_confidence(
-            scenario['logits'],
-            scenario['error_type'],
-            scenario['historical_data']
-        )
+    for name, logits, error_type, confidence_score in zip(names, logits_rows, error_types, confidence_scores):
+        print(f"\n📊 {name}:")
+        print(f"   Logits: {logits}")
+        print(f"   Error Type: {error_type}")
 
-        print(".3f"        print(".3f"        print(".3f"        print(f"   Calibration: {confidence_score.calibration_method}")
+        print(f"   Overall Confidence: {confidence_score.overall_confidence:.3f}")
+        print(f"   Syntax Confidence: {confidence_score.syntax_confidence:.3f}")
+        print(f"   Logic Confidence: {confidence_score.logic_confidence:.3f}")
+        print(f"   Calibration: {confidence_score.calibration_method}")
         print(f"   Components: Historical={confidence_score.components.historical_success_rate:.2f}, "
               f"Pattern={confidence_score.components.pattern_similarity:.2f}, "
               f"Complexity={confidence_score.components.code_complexity_penalty:.2f}, "
               f"Coverage={confidence_score.components.test_coverage:.2f}")
 
         # Check if we should attempt fix
-        should_attempt = scorer.should_attempt_fix(confidence_score, scenario['error_type'])
+        should_attempt = scorer.should_attempt_fix(confidence_score, error_type)
         print(f"   Should Attempt Fix: {should_attempt}")
 
         # Record outcome for calibration (simulate some successes/failures)
         was_correct = confidence_score.overall_confidence > 0.7  # Simulate based on confidence
         scorer.record_outcome(confidence_score.overall_confidence, was_correct)
 
+@_buffered_output
 def demonstrate_dual_circuit_breaker():
     """Demonstrate the dual circuit breaker system"""
     print("\n🔄 DUAL CIRCUIT BREAKER DEMO")
@@ -128,6 +148,7 @@ def demonstrate_dual_circuit_breaker():
 
     print(f"\n   Final State: {circuit_breaker.get_state_summary()}")
 
+@_buffered_output
 def demonstrate_cascading_error_handler():
     """Demonstrate the cascading error handler"""
     print("\n🔗 CASCADING ERROR HANDLER DEMO")
@@ -175,7 +196,7 @@ def demonstrate_cascading_error_handler():
 
     for i, error in enumerate(cascade_scenario):
         print(f"\n🔍 Error {i + 1}: {error['error_type']} - {error['message']}")
-        print(".3f"
+        print(f"   Confidence: {error['confidence']:.3f}")
         # Add to cascade
         error_handler.add_error_to_chain(
             error['error_type'],
@@ -198,10 +219,11 @@ def demonstrate_cascading_error_handler():
             break
 
     # Show final analysis
-    print("
-📊 FINAL CASCADE ANALYSIS:"    final_analysis = error_handler.get_cascade_analysis()
-    print(json.dumps(final_analysis, indent=2))
+    print("\n📊 FINAL CASCADE ANALYSIS:")
+    final_analysis = error_handler.get_cascade_analysis()
+    print(_pretty(final_analysis))
 
+@_buffered_output
 def demonstrate_sandbox_execution():
     """Demonstrate sandbox execution with resource limits"""
     print("\n🏖️  SANDBOX EXECUTION DEMO")
@@ -243,6 +265,7 @@ def demonstrate_sandbox_execution():
         summary = sandbox.get_execution_summary()
         print(f"   Test Success Rate: {summary['test_success_rate']:.1%}")
 
+@_buffered_output
 def demonstrate_complete_system():
     """Demonstrate the complete integrated system"""
     print("\n🚀 COMPLETE SYSTEM INTEGRATION DEMO")
@@ -298,7 +321,8 @@ def demonstrate_complete_system():
         should_stop, cascade_reason = error_handler.should_stop_attempting()
 
         print(f"   Error: {step_data['message']}")
-        print(".3f"        print(f"   Circuit Breaker: {'✅ OK' if can_attempt else '❌ Blocked'} ({cb_reason})")
+        print(f"   Confidence: {confidence.overall_confidence:.3f}")
+        print(f"   Circuit Breaker: {'✅ OK' if can_attempt else '❌ Blocked'} ({cb_reason})")
         print(f"   Cascade Check: {'🛑 Stop' if should_stop else '✅ Continue'} ({cascade_reason})")
 
         # Determine if we should proceed
@@ -342,8 +366,8 @@ def demonstrate_complete_system():
             break
 
     # Final system state
-    print("
-🏁 FINAL SYSTEM STATE:"    print(f"   Circuit Breaker: {circuit_breaker.get_state_summary()['circuit_state']}")
+    print("\n🏁 FINAL SYSTEM STATE:")
+    print(f"   Circuit Breaker: {circuit_breaker.get_state_summary()['circuit_state']}")
     print(f"   Error Cascade: {error_handler.get_cascade_analysis()['cascade_depth']} errors")
     print(f"   Sandbox Tests: {sandbox.get_execution_summary()['tests_passed']}/{sandbox.get_execution_summary()['tests_total']} passed")
 